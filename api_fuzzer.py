@@ -1,7 +1,15 @@
 import argparse
-from fuzzer_engine import run_fuzzer
+from fuzzer_engine import REDACTED, SECRET_ARGS, run_fuzzer
 from swagger_parser import parse_swagger
+from request_template import find_placeholders
+from checkpoint import load_checkpoint
+from results_db import ResultsDB
+from log_writer import read_log_records
+from response_archive import read_archive_index, read_entry
 from rich import print as rprint
+from rich.console import Console
+from rich.table import Table
+import os
 import sys
 
 
@@ -16,17 +24,160 @@ def parse_swagger_cached(swagger_file):
     swagger_cache[swagger_file] = endpoints
     return endpoints
 
+def query_main(argv):
+    # python api_fuzzer.py query results/run.sqlite --status 500 --param email
+    parser = argparse.ArgumentParser(prog="api_fuzzer.py query", description="Query a --db results store")
+    parser.add_argument("db", help="Path to the SQLite store written with --db")
+    parser.add_argument("--status", help="Comma-separated list of status codes")
+    parser.add_argument("--param", help="Only requests fuzzing this param")
+    parser.add_argument("--payload", help="Only requests sending this exact payload")
+    parser.add_argument("--min-length", type=int, help="Minimum response length")
+    parser.add_argument("--max-length", type=int, help="Maximum response length")
+    parser.add_argument("--longer-than-baseline", type=float, metavar="PERCENT", help="Responses longer than the baseline by more than PERCENT")
+    parser.add_argument("--hash", help="Response body SHA-1 (or a prefix of it)")
+    parser.add_argument("--interesting", action="store_true", help="Only responses that differed from the baseline")
+    parser.add_argument("--show", type=int, metavar="NUM", help="Print the full stored response of request NUM")
+    parser.add_argument("--limit", type=int, default=100, help="Max rows to print (0 = all, default 100)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        rprint(f"[red][-] No results store at {args.db}[/red]")
+        sys.exit(1)
+
+    with ResultsDB(args.db) as db:
+        if args.show:
+            row = db.response(args.show)
+            if not row:
+                rprint(f"[red][-] No stored response for request {args.show}[/red]")
+                sys.exit(1)
+            status, reason, headers, body = row
+            print(f"HTTP/1.1 {status} {reason}\n{headers}\n\n{body}")
+            return
+
+        status = [int(x.strip()) for x in args.status.split(",") if x.strip()] if args.status else None
+        rows = db.query(status=status, param=args.param, payload=args.payload,
+                        min_length=args.min_length, max_length=args.max_length,
+                        longer_than_baseline=args.longer_than_baseline, hash_prefix=args.hash,
+                        interesting=args.interesting, limit=args.limit)
+
+    table = Table(title=f"{len(rows)} result(s)")
+    for column in ("#", "Param", "Payload", "Status", "Length", "Hash", "URL"):
+        table.add_column(column)
+    for num, param, payload, status_code, length, body_hash, url in rows:
+        table.add_row(str(num), param, payload, str(status_code), str(length), body_hash[:12], url)
+    Console().print(table)
+
+
+def logs_main(argv):
+    # python api_fuzzer.py logs results/responses.txt --grep "SQL syntax"
+    parser = argparse.ArgumentParser(prog="api_fuzzer.py logs", description="Print a --save-request/--save-response log, "
+                                     "across its compressed or rotated segments")
+    parser.add_argument("log", help="Log path as written without compression/rotation, e.g. results/responses.txt")
+    parser.add_argument("--grep", help="Only records containing this text")
+    parser.add_argument("--limit", type=int, default=0, help="Max records to print (default all)")
+    args = parser.parse_args(argv)
+
+    shown = 0
+    for record in read_log_records(args.log):
+        if args.grep and args.grep not in record:
+            continue
+        sys.stdout.write(record)
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+    if not shown:
+        rprint(f"[yellow][!] No records found in {args.log}[/yellow]")
+
+
+def _safe_name(text):
+    return str(text).replace("/", "_").replace("\\", "_").replace(" ", "_")[:100]
+
+
+def archive_main(argv):
+    # python api_fuzzer.py archive results/saved --status 500
+    parser = argparse.ArgumentParser(prog="api_fuzzer.py archive", description="List or extract responses saved with --save")
+    parser.add_argument("archive", help="Archive path without extension, e.g. results/saved")
+    parser.add_argument("--param", help="Only responses for this param")
+    parser.add_argument("--payload", help="Only responses for this exact payload")
+    parser.add_argument("--status", help="Comma-separated list of status codes")
+    parser.add_argument("--extract", type=int, metavar="NUM", help="Print the saved response of request NUM")
+    parser.add_argument("-o", "--output", help="With --extract, write the response to this file instead")
+    parser.add_argument("--extract-all", metavar="DIR", help="Write every matching response to its own file in DIR")
+    parser.add_argument("--limit", type=int, default=100, help="Max rows to list (0 = all, default 100)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.archive + ".index"):
+        rprint(f"[red][-] No archive at {args.archive}(.index/.data)[/red]")
+        sys.exit(1)
+
+    status = {int(x.strip()) for x in args.status.split(",") if x.strip()} if args.status else None
+    entries = [e for e in read_archive_index(args.archive)
+               if (args.extract is None or e["num"] == args.extract)
+               and (not args.param or e["param"] == args.param)
+               and (args.payload is None or e["payload"] == args.payload)
+               and (not status or e["status"] in status)]
+
+    if args.extract is not None:
+        if not entries:
+            rprint(f"[red][-] No saved response for request {args.extract}[/red]")
+            sys.exit(1)
+        head, body = read_entry(args.archive, entries[0])
+        if args.output:
+            with open(args.output, "wb") as out:
+                out.write(head + body)
+            rprint(f"[green][+] Response of request {args.extract} written to {args.output}[/green]")
+        else:
+            sys.stdout.buffer.write(head + body + b"\n")
+        return
+
+    if args.extract_all:
+        os.makedirs(args.extract_all, exist_ok=True)
+        with open(args.archive + ".data", "rb") as data:
+            for entry in entries:
+                head, body = read_entry(args.archive, entry, data)
+                name = f"{entry['num']}_{_safe_name(entry['param'])}_{_safe_name(entry['payload'])}.txt"
+                with open(os.path.join(args.extract_all, name), "wb") as out:
+                    out.write(head + body)
+        rprint(f"[green][+] {len(entries)} response(s) written to {args.extract_all}[/green]")
+        return
+
+    shown = entries[:args.limit] if args.limit else entries
+    table = Table(title=f"{len(entries)} saved response(s), {len({e['sha1'] for e in entries})} distinct bodies")
+    for column in ("#", "Param", "Payload", "Status", "Body hash"):
+        table.add_column(column)
+    for entry in shown:
+        table.add_row(str(entry["num"]), entry["param"], str(entry["payload"]), str(entry["status"]), entry["sha1"][:12])
+    Console().print(table)
+
+
 def main():
+    # Subcommand: inspect a --db results store after a run
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        query_main(sys.argv[2:])
+        return
+
+    # Subcommand: read request/response logs back
+    if len(sys.argv) > 1 and sys.argv[1] == "logs":
+        logs_main(sys.argv[2:])
+        return
+
+    # Subcommand: list/extract responses saved with --save
+    if len(sys.argv) > 1 and sys.argv[1] == "archive":
+        archive_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="API Param Fuzzer CLI")
     parser.add_argument("--url", help="Target URL")
     parser.add_argument("--method", choices=["POST", "PUT"], help="HTTP method")
     parser.add_argument("--body", help="Request body with <<FUZZ_param>> placeholders")
     parser.add_argument("--params", help="Comma-separated list of param names to fuzz")
     parser.add_argument("--wordlist", help="Path to wordlist file")
-    parser.add_argument("--delay", type=float, default=0.1, help="Delay between requests (seconds)")
-    parser.add_argument("--save", action="store_true", help="Save interesting responses to separate files")
+    parser.add_argument("--delay", type=float, default=0.1, help="Delay between requests per thread/slot (seconds), used when --rate is not set")
+    parser.add_argument("--save", action="store_true", help="Save interesting responses to the results/saved archive (see: api_fuzzer.py archive)")
     parser.add_argument("--save-request", action="store_true", help="Save all HTTP requests to results/requests.txt")
     parser.add_argument("--save-response", action="store_true", help="Save all HTTP responses to results/responses.txt")
+    parser.add_argument("--log-compress", choices=["gzip", "zstd"], help="Compress the request/response logs (zstd requires the zstandard package)")
+    parser.add_argument("--log-segment-mb", type=float, help="Rotate the request/response logs into numbered segments of about this many MB")
     parser.add_argument("--filter-status-codes", help="Comma-separated list of status codes to show (whitelist)")
     parser.add_argument("--hide-status-codes", help="Comma-separated list of status codes to hide (blacklist)")
     parser.add_argument("--swagger-file", help="Path to Swagger file")
@@ -37,7 +188,32 @@ def main():
     parser.add_argument("--report", help="Path to HTML report output (e.g. results/report.html)")
     parser.add_argument("--auth-header", help="Authorization header value (e.g. 'Bearer <token>')")
     parser.add_argument("--include-regex", help="Regex pattern to match in response body before displaying/saving")
+    parser.add_argument("--reflected", nargs="?", const="raw,url,html,json", metavar="FORMS", help="Only keep responses that reflect their payload, optionally only in these forms (comma-separated: raw,url,html,json)")
+    parser.add_argument("--signatures", help="File of regex signatures (one per line, optionally 'name: pattern') to report in every response")
     parser.add_argument("--headers",help="Custom headers as JSON string, e.g. '{\"Authorization\": \"Bearer xyz\", \"X-API-Key\": \"abc\"}'")
+    parser.add_argument("--raw-payloads", action="store_true", help="Insert payloads verbatim instead of escaping them for JSON/URL/header context")
+    parser.add_argument("--max-body-bytes", type=int, help="Read at most this many bytes of each response body; the rest is dropped")
+    parser.add_argument("--status-only", action="store_true", help="Do not read response bodies: compare and report status codes and headers only")
+    parser.add_argument("--pool-size", type=int, default=10, help="Max pooled keep-alive connections per host")
+    parser.add_argument("--max-idle", type=float, default=30.0, help="Close pooled connections idle longer than this (seconds)")
+    parser.add_argument("--no-keep-alive", action="store_true", help="Disable connection reuse (send 'Connection: close')")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync", help="Request engine: serial 'sync' or concurrent 'async' (requires aiohttp)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests kept in flight with --engine async")
+    parser.add_argument("--threads", type=int, default=1, help="Send requests from a pool of N threads (sync engine)")
+    parser.add_argument("--workers", type=int, default=1, help="Shard the payload space across N processes")
+    parser.add_argument("--checkpoint", help="Periodically save campaign progress to this file")
+    parser.add_argument("--checkpoint-interval", type=float, default=5.0, help="Seconds between checkpoints (default 5)")
+    parser.add_argument("--resume", help="Continue a campaign from a checkpoint file (other arguments are restored from it)")
+    parser.add_argument("--rate", type=float, help="Overall requests per second across all threads/slots (overrides --delay)")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt the rate: back off on 429/503, Retry-After or rising latency, speed up while healthy")
+    parser.add_argument("--max-rate", type=float, help="Upper bound for the rate with --adaptive (requests per second)")
+    parser.add_argument("--ignore-paths", help="Comma-separated JSON paths to ignore when diffing against the baseline, e.g. 'root.requestId,root.items[*].updatedAt,root.**.timestamp'")
+    parser.add_argument("--baseline-samples", type=int, default=3, help="Send the baseline request N times and ignore fields that vary between them (default 3)")
+    parser.add_argument("--baseline-refresh", type=float, default=0, help="Re-sample the baseline every N seconds and re-learn volatile fields if it drifted (default off)")
+    parser.add_argument("--cluster", type=int, default=0, metavar="N", help="Group near-duplicate responses and keep only the first N of each cluster; the rest are only counted (default off)")
+    parser.add_argument("--cluster-distance", type=int, default=6, help="Max differing SimHash bits (of 64) for two responses to share a cluster (default 6)")
+    parser.add_argument("--db", help="Also store filtered requests/responses in this SQLite file for querying (see: api_fuzzer.py query --help)")
+    parser.add_argument("--shard", help="Only run slice i of N of the campaign (1-based, e.g. 2/4) to split a run across machines")
 
 
     args = parser.parse_args()
@@ -46,6 +222,24 @@ def main():
     if args.params:
         args.params = [p.strip() for p in args.params.split(",") if p.strip()]
 
+    # --resume on its own restores the campaign arguments saved in the checkpoint
+    if args.resume and not args.url and not args.swagger_file:
+        try:
+            saved_args = load_checkpoint(args.resume)["args"]
+        except (OSError, ValueError, KeyError) as e:
+            rprint(f"[red][-] Cannot read checkpoint {args.resume}: {e}[/red]")
+            sys.exit(1)
+        for key, value in saved_args.items():
+            if key in ("resume", "checkpoint"):
+                continue
+            if value == REDACTED and key in SECRET_ARGS:
+                # Secrets are not stored in the checkpoint: they must be given again
+                if not getattr(args, key, None):
+                    rprint(f"[yellow][!] --{key.replace('_', '-')} was not saved in the checkpoint, "
+                           f"pass it again with --resume[/yellow]")
+                continue
+            setattr(args, key, value)
+
 
     if args.params and args.swagger_file:
         rprint(f"[yellow][!] No parameters are explicitly required if swagger file is used.[/yellow]")
@@ -57,7 +251,8 @@ def main():
     
     if args.params:
 
-        unused_params = [p for p in args.params if f"<<FUZZ_{p}>>" not in args.url and f"<<FUZZ_{p}>>" not in args.body]
+        placeholders = find_placeholders(args.url) | find_placeholders(args.body)
+        unused_params = [p for p in args.params if p not in placeholders]
         if unused_params:
             rprint(f"[red][-] The following parameters are not used in URL or body and cannot be fuzzed: {', '.join(unused_params)}[/red]")
             sys.exit(1)
@@ -255,6 +450,33 @@ def main():
             auth_header = args.auth_header
             include_regex = args.include_regex if args.include_regex else ""
             headers = selected_ep.get("headers", {})
+            raw_payloads = args.raw_payloads
+            pool_size = args.pool_size
+            max_idle = args.max_idle
+            no_keep_alive = args.no_keep_alive
+            engine = args.engine
+            concurrency = args.concurrency
+            threads = args.threads
+            workers = args.workers
+            shard = args.shard
+            checkpoint = args.checkpoint
+            checkpoint_interval = args.checkpoint_interval
+            resume = args.resume
+            rate = args.rate
+            adaptive = args.adaptive
+            max_rate = args.max_rate
+            db = args.db
+            ignore_paths = args.ignore_paths
+            baseline_samples = args.baseline_samples
+            baseline_refresh = args.baseline_refresh
+            cluster = args.cluster
+            cluster_distance = args.cluster_distance
+            signatures = args.signatures
+            reflected = args.reflected
+            max_body_bytes = args.max_body_bytes
+            status_only = args.status_only
+            log_compress = args.log_compress
+            log_segment_mb = args.log_segment_mb
 
 
         # Now run your fuzzer
@@ -5,10 +5,14 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext
 import json
 import os
 import threading
-from fuzzer_engine import run_fuzzer
+from engine_events import CancelToken, QueueEvents
+from fuzzer_engine import resumable_checkpoint, run_fuzzer
 from swagger_parser import parse_swagger
+from request_template import find_placeholders
+from gui_console import Console, FRAME_MS
+from gui_results import ResultStore, ResultsGrid
+import queue
 import sys
-from io import StringIO
 
 class APIFuzzerGUI:
     def __init__(self, root):
@@ -30,12 +34,19 @@ class APIFuzzerGUI:
         # Fuzzing control variables
         self.fuzzing_active = False
         self.fuzzing_thread = None
-        self.stop_event = threading.Event()
+        self.cancel_token = CancelToken()
+        
+        # (kind, data) events from the engine running in the fuzzing thread
+        self.events_queue = queue.SimpleQueue()
+        self.result_store = ResultStore()
         
         self.create_widgets()
         self.toggle_mode()
         self.validate_fields()  # Initial validation
         
+        # Fuzzer output is queued by the worker thread and drawn here, once per frame
+        self.root.after(FRAME_MS, self.poll_output)
+        
     def create_widgets(self):
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.root)
@@ -183,6 +194,24 @@ class APIFuzzerGUI:
         self.proxy_entry.grid(row=0, column=1, sticky=tk.EW, padx=5)
         self.proxy_entry.insert(0, "http://127.0.0.1:8080")
         
+        # Engine: how requests are sent (same choices and defaults as the CLI)
+        engine_frame = ttk.LabelFrame(advanced_frame, text="Engine", padding=10)
+        engine_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(engine_frame, text="Engine:").grid(row=0, column=0, sticky=tk.W, pady=2)
+        self.engine_var = tk.StringVar(value="sync")
+        ttk.Combobox(engine_frame, textvariable=self.engine_var, values=["sync", "async"],
+                     state="readonly", width=8).grid(row=0, column=1, sticky=tk.W, padx=5)
+        
+        self.engine_entries = {}
+        for row, (name, label, default) in enumerate((("threads", "Threads (sync):", "1"),
+                                                      ("concurrency", "Concurrency (async):", "10")), 1):
+            ttk.Label(engine_frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            entry = ttk.Entry(engine_frame, width=10)
+            entry.grid(row=row, column=1, sticky=tk.W, padx=5)
+            entry.insert(0, default)
+            self.engine_entries[name] = entry
+        
         # Headers
         headers_frame = ttk.LabelFrame(advanced_frame, text="Headers", padding=10)
         headers_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -235,13 +264,29 @@ class APIFuzzerGUI:
         ttk.Button(report_frame, text="Browse", 
                   command=self.browse_report_file).grid(row=0, column=2, padx=5)
         
+        ttk.Label(report_frame, text="Checkpoint File:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.checkpoint_entry = ttk.Entry(report_frame, width=40)
+        self.checkpoint_entry.grid(row=1, column=1, sticky=tk.EW, padx=5)
+        ttk.Label(report_frame, text="(stopped runs resume from here)").grid(row=1, column=2, sticky=tk.W, padx=5)
+        
         # Output Tab
         self.output_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.output_frame, text="Output")
         
+        # Live counters from the engine's stats snapshots
+        self.progress_label = ttk.Label(self.output_frame, text="")
+        self.progress_label.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
+        
         # Output text area
         self.output_text = scrolledtext.ScrolledText(self.output_frame, wrap=tk.WORD)
         self.output_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.console = Console(self.output_text)
+        
+        # Results Tab: sortable/filterable grid of every finding
+        results_frame = ttk.Frame(self.notebook)
+        self.notebook.add(results_frame, text="Results")
+        self.results_grid = ResultsGrid(results_frame, self.result_store)
+        self.results_grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Help Tab
         help_frame = ttk.Frame(self.notebook)
@@ -300,7 +345,7 @@ FUZZING CONTROL:
 OUTPUT & LOGGING:
 | Argument              | Description                                                   | Default  |
 |-----------------------|---------------------------------------------------------------|----------|
-| --save                | Save interesting responses to separate files                 | False    |
+| --save                | Save interesting responses to the results/saved archive      | False    |
 | --save-request        | Save all HTTP requests to results/requests.txt              | False    |
 | --save-response       | Save all HTTP responses to results/responses.txt            | False    |
 | --report              | Path to HTML report output (e.g. results/report.html)       | None     |
@@ -757,8 +802,7 @@ For more information and updates, visit the project repository.
             for i, endpoint in enumerate(self.swagger_endpoints):
                 self.endpoints_listbox.insert(i, f"{endpoint['method']} {endpoint['url']}")
             
-            self.output_text.insert(tk.END, f"Loaded {len(self.swagger_endpoints)} endpoints from {swagger_file}\n")
-            self.output_text.see(tk.END)
+            self.console.write(f"Loaded {len(self.swagger_endpoints)} endpoints from {swagger_file}\n")
             self.validate_fields()
             
         except Exception as e:
@@ -826,7 +870,7 @@ For more information and updates, visit the project repository.
             self.validate_fields()
     
     def clear_output(self):
-        self.output_text.delete(1.0, tk.END)
+        self.console.clear()
     
     def add_header_row(self, key="", value=""):
         """Add a new header key-value row"""
@@ -927,10 +971,8 @@ For more information and updates, visit the project repository.
                 body_text = self.body_text.get(1.0, tk.END)
                 
                 # Check if parameters are used in URL or body
-                unused_params = []
-                for param in params:
-                    if f"<<FUZZ_{param}>>" not in url_text and f"<<FUZZ_{param}>>" not in body_text:
-                        unused_params.append(param)
+                placeholders = find_placeholders(url_text) | find_placeholders(body_text)
+                unused_params = [param for param in params if param not in placeholders]
                 
                 if unused_params:
                     self.status_label.config(text=f"Parameters not used in URL/body: {', '.join(unused_params)}", 
@@ -1015,31 +1057,62 @@ For more information and updates, visit the project repository.
         url_text = self.url_entry.get()
         body_text = self.body_text.get(1.0, tk.END)
         
-        for param in params:
-            if f"<<FUZZ_{param}>>" not in url_text and f"<<FUZZ_{param}>>" not in body_text:
-                return False
-        return True
+        placeholders = find_placeholders(url_text) | find_placeholders(body_text)
+        return all(param in placeholders for param in params)
     
     def redirect_output(self):
-        class OutputRedirector:
-            def __init__(self, text_widget):
-                self.text_widget = text_widget
-                
-            def write(self, text):
-                self.text_widget.insert(tk.END, text)
-                self.text_widget.see(tk.END)
-                self.text_widget.update()
-                
-            def flush(self):
-                pass
-        
-        sys.stdout = OutputRedirector(self.output_text)
-        sys.stderr = OutputRedirector(self.output_text)
+        # Prints from the fuzzing thread only queue text; poll_output() draws it
+        sys.stdout = self.console.writer
+        sys.stderr = self.console.writer
     
     def restore_output(self):
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
     
+    def poll_output(self):
+        """Tk loop side of the queues: draw what was printed, apply engine events, notice finished runs"""
+        self.console.drain()
+        added = 0
+        try:
+            while True:
+                kind, data = self.events_queue.get_nowait()
+                if kind == "finding":
+                    self.result_store.append(*data)
+                    added += 1
+                else:
+                    self.handle_event(kind, data)
+        except queue.Empty:
+            pass
+        if added:
+            self.results_grid.refresh()
+        if self.fuzzing_thread is not None and not self.fuzzing_thread.is_alive():
+            self.fuzzing_thread = None
+            self.fuzzing_active = False
+            self.restore_output()
+            self.console.drain()
+            self.start_button.config(state="normal")
+            self.stop_button.config(state="disabled")
+        self.root.after(FRAME_MS, self.poll_output)
+    
+    def handle_event(self, kind, data):
+        if kind == "progress":
+            self.progress_label.config(text=(
+                f"{data['done']}/{data['total']} sent | {data['errors']} errors | {data['matched']} matched | "
+                f"{data['interesting']} interesting | {data['findings']} findings | {data['rate']:.1f} req/s"))
+        elif kind == "result":
+            line = f"[+] #{data['num']} {data['param']} = {data['payload']} | Status: {data['status']}, Length: {data['length']}"
+            if data["signatures"]:
+                line += f" | Signatures: {', '.join(data['signatures'])}"
+            if data["reflected"]:
+                line += f" | Reflected: {', '.join(data['reflected'])}"
+            if data["cluster"]:
+                line += f" | Cluster: #{data['cluster']}"
+            self.console.write(line + "\n")
+        elif kind == "error":
+            self.console.write(f"[-] Error sending request {data['num']} payload '{data['payload']}': {data['error']}\n")
+        elif kind == "notice":
+            self.console.write(f"[!] {data}\n")
+    
     def validate_inputs(self):
         if self.mode_var.get() == "manual":
             if not self.url_entry.get().strip():
@@ -1063,6 +1136,12 @@ For more information and updates, visit the project repository.
             messagebox.showerror("Error", "Wordlist is required")
             return False
         
+        for name, entry in self.engine_entries.items():
+            value = entry.get().strip()
+            if not value.isdigit() or int(value) < 1:
+                messagebox.showerror("Error", f"{name.capitalize()} must be a positive whole number")
+                return False
+        
         return True
     
     def create_args_object(self):
@@ -1127,6 +1206,33 @@ For more information and updates, visit the project repository.
         args.filter_status_codes = self.filter_status_entry.get().strip()
         args.hide_status_codes = self.hide_status_entry.get().strip()
         args.report = self.report_entry.get().strip() or None
+        args.engine = self.engine_var.get()
+        for name, entry in self.engine_entries.items():
+            setattr(args, name, int(entry.get()))
+        # Worker processes cannot stream results to the GUI or be stopped: CLI only
+        args.workers = 1
+        args.shard = None
+        args.pool_size = 10
+        args.max_idle = 30.0
+        args.no_keep_alive = False
+        args.raw_payloads = False
+        args.checkpoint = self.checkpoint_entry.get().strip() or None
+        args.resume = None
+        args.rate = None
+        args.adaptive = False
+        args.max_rate = None
+        args.db = None
+        args.ignore_paths = None
+        args.baseline_samples = 3
+        args.baseline_refresh = 0
+        args.cluster = 0
+        args.cluster_distance = 6
+        args.signatures = None
+        args.reflected = None
+        args.max_body_bytes = None
+        args.status_only = False
+        args.log_compress = None
+        args.log_segment_mb = None
         
         return args
     
@@ -1139,36 +1245,42 @@ For more information and updates, visit the project repository.
         # Switch to Output tab automatically
         self.notebook.select(self.output_frame)
         
-        # Reset and set up stop event
-        self.stop_event.clear()
+        # A fresh cancellation token per run
+        self.cancel_token = CancelToken()
+        cancel = self.cancel_token
+        
+        # A stopped run picks up where it left off; a finished run, or one
+        # whose fields were edited since, starts over (and overwrites the checkpoint)
+        if resumable_checkpoint(args, args.params):
+            args.resume = args.checkpoint
+        elif args.checkpoint and os.path.exists(args.checkpoint):
+            self.console.write(f"Checkpoint {args.checkpoint} is complete or for another campaign, starting fresh\n")
         
         # Update UI state
         self.fuzzing_active = True
         self.start_button.config(state="disabled")
         self.stop_button.config(state="normal")
         
-        self.output_text.insert(tk.END, "Starting API Fuzzer...\n")
-        self.output_text.see(tk.END)
+        self.console.write("Starting API Fuzzer...\n")
+        self.result_store.clear()
+        self.results_grid.refresh()
+        self.redirect_output()
         
+        # Same engine as the CLI; it never touches Tk: events and printed
+        # text go through queues, and poll_output() resets the UI once
+        # this thread has finished
         def run_fuzzing():
             try:
-                self.redirect_output()
-                # Run fuzzer with stop event
-                self.run_interruptible_fuzzer(args, args.params)
-                if self.fuzzing_active and not self.stop_event.is_set():
-                    self.output_text.insert(tk.END, "\nFuzzing completed!\n")
-                elif self.stop_event.is_set():
-                    self.output_text.insert(tk.END, "\nFuzzing stopped by user.\n")
+                counters = run_fuzzer(args, args.params, events=QueueEvents(self.events_queue), cancel=cancel)
+                if cancel.cancelled:
+                    self.console.write("\nFuzzing stopped by user.\n")
+                elif counters is not None:
+                    self.console.write("\nFuzzing completed!\n")
+            except SystemExit:
+                # run_fuzzer has already printed why it could not run
+                self.console.write("\nFuzzing aborted.\n")
             except Exception as e:
-                if self.fuzzing_active:
-                    self.output_text.insert(tk.END, f"\nError: {str(e)}\n")
-            finally:
-                self.restore_output()
-                # Reset UI state
-                self.fuzzing_active = False
-                self.start_button.config(state="normal")
-                self.stop_button.config(state="disabled")
-                self.fuzzing_thread = None
+                self.console.write(f"\nError: {str(e)}\n")
         
         # Run fuzzing in a separate thread to prevent GUI freezing
         self.fuzzing_thread = threading.Thread(target=run_fuzzing, daemon=True)
@@ -1178,157 +1290,11 @@ For more information and updates, visit the project repository.
         """Stop the currently running fuzzing operation"""
         if self.fuzzing_active and self.fuzzing_thread:
             self.fuzzing_active = False
-            self.stop_event.set()  # Signal the fuzzer to stop
-            self.output_text.insert(tk.END, "\n[STOPPING] Stopping fuzzing...\n")
-            self.output_text.see(tk.END)
+            self.cancel_token.cancel()  # No new requests; in-flight ones, checkpoint and report still finish
+            self.console.write("\n[STOPPING] Stopping fuzzing...\n")
             
-            # Reset UI state immediately for responsiveness
-            self.start_button.config(state="normal")
+            # Start is re-enabled by poll_output() once the run has wound down
             self.stop_button.config(state="disabled")
-    
-    def run_interruptible_fuzzer(self, args, params):
-        """Run fuzzer with interruption support - custom implementation"""
-        import itertools
-        import requests
-        import time
-        import re
-        from request_utils import prepare_and_send_request
-        from baseline_analyzer import is_interesting
-        from report_generator import generate_html_report
-        
-        try:
-            # Read wordlist
-            if not os.path.exists(args.wordlist):
-                raise FileNotFoundError(f"Wordlist not found: {args.wordlist}")
-                
-            with open(args.wordlist, "r", encoding="utf-8", errors="ignore") as f:
-                payloads = [line.strip() for line in f if line.strip()]
-            
-            if not payloads:
-                print("[red][-] No payloads found in wordlist[/red]")
-                return
-                
-            # Setup headers
-            headers = {"Content-Type": "application/json"}
-            if args.auth_header:
-                headers["Authorization"] = args.auth_header
-            if args.headers:
-                try:
-                    custom_headers = json.loads(args.headers)
-                    headers.update(custom_headers)
-                except json.JSONDecodeError:
-                    pass
-            
-            # Setup proxies
-            proxies = None
-            if args.proxy:
-                proxies = {"http": args.proxy, "https": args.proxy}
-            
-            # Setup regex filter
-            include_regex = args.include_regex if hasattr(args, 'include_regex') else None
-            
-            responses = []
-            
-            if args.combo and len(params) > 1:
-                # Combo mode fuzzing
-                param_payload_lists = {param: payloads for param in params}
-                all_combos = list(itertools.product(*param_payload_lists.values()))
-                param_order = list(param_payload_lists.keys())
-                total_combos = len(all_combos)
-                
-                for current_combo_num, combo in enumerate(all_combos, 1):
-                    # Check for stop signal
-                    if self.stop_event.is_set():
-                        print(f"\n[STOPPING] Fuzzing interrupted at combo {current_combo_num}/{total_combos}")
-                        break
-                    
-                    # Build fuzzed body and URL
-                    fuzzed_body = args.body
-                    fuzzed_url = args.url
-                    
-                    for i, param in enumerate(param_order):
-                        placeholder = f"<<FUZZ_{param}>>"
-                        fuzzed_body = fuzzed_body.replace(placeholder, combo[i])
-                        fuzzed_url = fuzzed_url.replace(placeholder, combo[i])
-                    
-                    # Status update
-                    status_line = f"[*] Combo {current_combo_num}/{total_combos} | Param Values: {dict(zip(param_order, combo))}"
-                    print(f"\r{status_line}", end="", flush=True)
-                    
-                    # Send request
-                    try:
-                        prepared, response = prepare_and_send_request(
-                            args.method, fuzzed_url, data=fuzzed_body, 
-                            headers=headers, proxies=proxies
-                        )
-                        
-                        # Apply regex filter if specified
-                        if include_regex and not re.search(include_regex, response.text, re.IGNORECASE):
-                            continue
-                            
-                        responses.append((prepared, response))
-                        
-                        # Show response info
-                        print(f"\n[{response.status_code}] Length: {len(response.text)}")
-                        
-                    except Exception as e:
-                        print(f"\n[red][-] Error sending request: {e}[/red]")
-                    
-                    # Delay between requests
-                    if args.delay > 0:
-                        time.sleep(args.delay)
-            else:
-                # Single parameter fuzzing
-                param = params[0]
-                total_payloads = len(payloads)
-                
-                for current_num, payload in enumerate(payloads, 1):
-                    # Check for stop signal
-                    if self.stop_event.is_set():
-                        print(f"\n[STOPPING] Fuzzing interrupted at payload {current_num}/{total_payloads}")
-                        break
-                    
-                    # Build fuzzed body and URL
-                    placeholder = f"<<FUZZ_{param}>>"
-                    fuzzed_body = args.body.replace(placeholder, payload)
-                    fuzzed_url = args.url.replace(placeholder, payload)
-                    
-                    # Status update
-                    print(f"\r[*] {current_num}/{total_payloads} | Payload: {payload[:50]}", end="", flush=True)
-                    
-                    # Send request
-                    try:
-                        prepared, response = prepare_and_send_request(
-                            args.method, fuzzed_url, data=fuzzed_body, 
-                            headers=headers, proxies=proxies
-                        )
-                        
-                        # Apply regex filter if specified
-                        if include_regex and not re.search(include_regex, response.text, re.IGNORECASE):
-                            continue
-                            
-                        responses.append((prepared, response))
-                        
-                        # Show response info
-                        print(f"\n[{response.status_code}] Length: {len(response.text)}")
-                        
-                    except Exception as e:
-                        print(f"\n[red][-] Error sending request: {e}[/red]")
-                    
-                    # Delay between requests
-                    if args.delay > 0:
-                        time.sleep(args.delay)
-            
-            # Generate report if specified
-            if args.report and responses:
-                generate_html_report(responses, args.report)
-                print(f"\n[green][+] HTML report generated: {args.report}[/green]")
-            
-            if not self.stop_event.is_set():
-                print(f"\n[green][+] Fuzzing completed! Total responses: {len(responses)}[/green]")
-                
-        except Exception as e:
-            raise e
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import time
+from collections import deque
+
+from request_utils import CHUNK_SIZE, DRAIN_LIMIT, BufferedResponse
+
+try:
+    import aiohttp
+except ImportError:  # optional, only needed for --engine async
+    aiohttp = None
+
+
+class AsyncPrepared:
+    """The parts of requests.PreparedRequest that Campaign.process() reads."""
+
+    def __init__(self, method, url, headers, body):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+async def _read_response(resp, max_bytes=None, read_body=True):
+    # Same bounded, hashed read as request_utils.read_response
+    digest = hashlib.sha1()
+    chunks = []
+    size = 0
+    truncated = False
+    if not read_body:
+        if resp.content_length is not None and resp.content_length <= DRAIN_LIMIT:
+            await resp.read()
+    else:
+        async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+            if max_bytes is not None and size + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - size]
+                truncated = True
+            digest.update(chunk)
+            chunks.append(chunk)
+            size += len(chunk)
+            if truncated:
+                break
+    return BufferedResponse(resp.status, resp.reason, resp.headers, b"".join(chunks),
+                            resp.charset, digest.hexdigest(), truncated)
+
+
+async def _fetch(session, semaphore, campaign, job):
+    proxy = campaign.args.proxy if getattr(campaign.args, "proxy", None) else None
+    limiter = campaign.limiter
+
+    async with semaphore:
+        await limiter.acquire_async()
+        started = time.monotonic()
+        try:
+            async with session.request(campaign.args.method, job.url, data=job.body,
+                                       headers=job.headers, proxy=proxy) as resp:
+                response = await _read_response(resp, campaign.max_body_bytes, campaign.read_body)
+                prepared = AsyncPrepared(resp.method, str(resp.request_info.url), resp.request_info.headers, job.body)
+            job.latency = time.monotonic() - started
+            limiter.observe(resp.status, job.latency, resp.headers.get("Retry-After"))
+            return (job, prepared, response, None)
+        except Exception as e:
+            limiter.observe(None, time.monotonic() - started)
+            return (job, None, None, e)
+
+
+async def _finish(campaign, result):
+    job, prepared, response, error = result
+    if error is None and campaign.baseline_due():
+        # Re-sampling the baseline is a blocking request: keep it off the event loop
+        campaign.refresh_baseline(await asyncio.to_thread(campaign.sample_baseline))
+    if error is not None:
+        campaign.fail(job, error)
+    else:
+        campaign.process(job, prepared, response)
+
+
+async def _run(campaign, concurrency, start, stop):
+    args = campaign.args
+    no_keep_alive = getattr(args, "no_keep_alive", False)
+
+    if no_keep_alive:
+        connector = aiohttp.TCPConnector(limit=concurrency, force_close=True)
+    else:
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=getattr(args, "max_idle", 30.0))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=None)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Bounded window of scheduled jobs, drained in job order so the
+        # logs, findings and report come out exactly as in the sync engine.
+        pending = deque()
+        for job in campaign.jobs(start, stop):
+            pending.append(asyncio.create_task(_fetch(session, semaphore, campaign, job)))
+            if len(pending) >= concurrency * 2:
+                await _finish(campaign, await pending.popleft())
+
+        while pending:
+            await _finish(campaign, await pending.popleft())
+
+
+def run_async_engine(campaign, concurrency, start=0, stop=None):
+    # run_fuzzer has already checked that aiohttp is installed
+    asyncio.run(_run(campaign, max(1, concurrency), start, stop))
@@ -1,33 +1,202 @@
-from deepdiff import DeepDiff
+import hashlib
 import json
+import re
+from collections import deque
+from json_diff import compile_paths, format_path, json_diff, json_equal
 
-def is_interesting(base_status, base_text, current_status, current_text, current_param=None):
-    status_changed = current_status != base_status
-    body_changed = False
+# Characters a volatile token (timestamp, id, nonce...) is made of
+VALUE_CHARS = "A-Za-z0-9+/_.:-"
+VALUE_CHAR_RE = re.compile(f"[{VALUE_CHARS}]")
+TOKEN_RE = re.compile(f"[{VALUE_CHARS}]+|[^{VALUE_CHARS}]+")
+ANCHOR_LENGTH = 16
+
+
+def body_hash(text):
+    return hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()
 
+
+def _parse_json(text):
     try:
-        base_json = json.loads(base_text)
-        current_json = json.loads(current_text)
-
-        # If current_param is provided, ignore diff in that key
-        exclude_paths = []
-        if current_param:
-            # Handle case-insensitive paths and nested paths:
-            # This is a simple version for flat JSON:
-            exclude_paths = [f"root['{current_param}']", f"root[\"{current_param}\"]"]
-
-        diff = DeepDiff(
-            base_json,
-            current_json,
-            ignore_order=True,
-            exclude_paths=exclude_paths
-        )
-
-        # body_changed only True if there are differences outside excluded path
-        body_changed = bool(diff)
-
-    except Exception as e:
-        # Fallback to length-based diff if not JSON or error occurs
-        body_changed = len(current_text) != len(base_text)
-
-    return status_changed, body_changed
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _differing_tokens(a, b, offset=0):
+    # (start, end) in a of the value tokens that differ, or None if a and b
+    # are not the same text with only some value tokens changed
+    tokens_a, tokens_b = TOKEN_RE.findall(a), TOKEN_RE.findall(b)
+    if len(tokens_a) != len(tokens_b):
+        return None
+    spans = []
+    pos = offset
+    for x, y in zip(tokens_a, tokens_b):
+        if x != y:
+            if not (VALUE_CHAR_RE.match(x) and VALUE_CHAR_RE.match(y)):
+                return None
+            spans.append((pos, pos + len(x)))
+        pos += len(x)
+    return spans
+
+
+def _volatile_anchors(a, b):
+    # Literal text right before each value token that differs between a and b.
+    # Linear: token by token over the whole body, else line by line, skipping
+    # lines whose structure changed (no general diff, it is quadratic).
+    spans = _differing_tokens(a, b)
+    if spans is None:
+        spans = []
+        lines_a, lines_b = a.splitlines(True), b.splitlines(True)
+        if len(lines_a) == len(lines_b):
+            offset = 0
+            for x, y in zip(lines_a, lines_b):
+                if x != y:
+                    spans += _differing_tokens(x, y, offset) or []
+                offset += len(x)
+
+    anchors = set()
+    last_end = 0
+    for start, end in spans:
+        anchor = a[max(last_end, start - ANCHOR_LENGTH):start]
+        if anchor.strip():
+            anchors.add(anchor)
+        last_end = end
+    return anchors
+
+
+class BaselineMask:
+    """What differs between identical baseline requests.
+
+    JSON paths (array indexes generalised to [*]) are excluded from diffs;
+    text regions are replaced by "*" before hashing non-JSON bodies.
+    Volatile headers are only reported, headers are not diffed.
+    """
+
+    def __init__(self, paths=(), headers=(), anchors=()):
+        self.paths = sorted(paths)
+        self.headers = sorted(headers)
+        self.anchors = sorted(anchors)
+        self._regex = None
+        if self.anchors:
+            alternation = "|".join(re.escape(anchor) for anchor in self.anchors)
+            self._regex = re.compile(f"({alternation})[{VALUE_CHARS}]+")
+
+    @classmethod
+    def learn(cls, samples):
+        """samples: (status, text, headers) of the same baseline request."""
+        paths, headers, anchors = set(), set(), set()
+        _, first_text, first_headers = samples[0]
+        first_json = _parse_json(first_text)
+        first_headers = {k.lower(): v for k, v in first_headers.items()}
+
+        for _, text, sample_headers in samples[1:]:
+            sample_headers = {k.lower(): v for k, v in sample_headers.items()}
+            headers |= {k for k in first_headers.keys() | sample_headers.keys()
+                        if first_headers.get(k) != sample_headers.get(k)}
+
+            sample_json = _parse_json(text) if first_json is not None else None
+            if sample_json is not None:
+                for path in json_diff(first_json, sample_json, ignore_order=False):
+                    paths.add(re.sub(r"\[\d+\]", "[*]", path))
+            elif text != first_text:
+                anchors |= _volatile_anchors(first_text, text)
+
+        return cls(paths, headers, anchors)
+
+    def apply(self, text):
+        return self._regex.sub(r"\1*", text) if self._regex else text
+
+    def __bool__(self):
+        return bool(self.paths or self.headers or self.anchors)
+
+
+class Baseline:
+    """The baseline response, parsed and hashed once for the whole campaign.
+
+    compare() settles most responses without touching JSON: same length and
+    hash means an identical body. Only the rest are parsed and diffed.
+    ignore_paths are excluded from every diff (e.g. root.items[*].updatedAt);
+    param_paths maps a param to where it sits in the request body, so its
+    echo is not a difference (see request_template.param_json_paths).
+    A mask learned from several samples hides volatile fields as well.
+    """
+
+    def __init__(self, status, text, ignore_paths=(), param_paths=None, mask=None, samples=None):
+        self.status = status
+        self.text = text
+        self.mask = mask or BaselineMask()
+        self.samples = deque(samples or [], maxlen=max(len(samples or []), 2))
+
+        masked = self.mask.apply(text)
+        self.length = len(masked)
+        self.hash = body_hash(masked)
+
+        try:
+            self.json = json.loads(text)
+            self.is_json = True
+        except ValueError:
+            self.json = None
+            self.is_json = False
+
+        self.ignore_paths = list(ignore_paths) + self.mask.paths
+        self.param_paths = param_paths or {}
+        self._excludes = {None: compile_paths(self.ignore_paths)}
+
+    @classmethod
+    def learn(cls, samples, ignore_paths=(), param_paths=None):
+        """Baseline from several (status, text, headers) samples of the baseline request."""
+        mask = BaselineMask.learn(samples) if len(samples) > 1 else None
+        status, text, _ = samples[-1]
+        return cls(status, text, ignore_paths, param_paths, mask=mask, samples=samples)
+
+    def refresh(self, status, text, headers):
+        """Check a fresh baseline sample; on drift re-learn the mask. Returns the new Baseline or None."""
+        status_changed, body_changed = self.compare(status, text)
+        self.samples.append((status, text, headers))
+        if not (status_changed or body_changed):
+            return None
+        ignore_paths = [p for p in self.ignore_paths if p not in self.mask.paths]
+        return Baseline.learn(list(self.samples), ignore_paths, self.param_paths)
+
+    def exclude_for(self, param):
+        """Compiled exclusion paths when fuzzing param (cached per param)."""
+        if param not in self._excludes:
+            paths = self.ignore_paths + [format_path([param])] + self.param_paths.get(param, [])
+            self._excludes[param] = compile_paths(paths)
+        return self._excludes[param]
+
+    def compare(self, current_status, current_text, current_param=None, content_hash=None):
+        """(status_changed, body_changed) of a response against the baseline.
+
+        content_hash, the SHA-1 of the raw body if already known, skips
+        hashing the text when nothing needs masking.
+        """
+        status_changed = current_status != self.status
+
+        # Fast path: identical body once volatile regions are masked
+        masked = self.mask.apply(current_text)
+        if content_hash is not None and not self.mask.anchors:
+            if content_hash == self.hash:
+                return status_changed, False
+        elif len(masked) == self.length and body_hash(masked) == self.hash:
+            return status_changed, False
+
+        if not self.is_json:
+            return status_changed, len(masked) != self.length
+
+        try:
+            current_json = json.loads(current_text)
+
+            # body_changed only True if there are differences outside excluded paths
+            body_changed = not json_equal(self.json, current_json, self.exclude_for(current_param))
+
+        except Exception as e:
+            # Fallback to length-based diff if not JSON or error occurs
+            body_changed = len(masked) != self.length
+
+        return status_changed, body_changed
+
+
+def is_interesting(base_status, base_text, current_status, current_text, current_param=None):
+    # One-off comparison; campaigns keep a Baseline instead of re-parsing it per response
+    return Baseline(base_status, base_text).compare(current_status, current_text, current_param)
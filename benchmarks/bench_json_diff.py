@@ -0,0 +1,111 @@
+"""Compare json_diff.json_equal with DeepDiff(ignore_order=True) on API-sized payloads.
+
+    pip install deepdiff
+    python benchmarks/bench_json_diff.py [--sizes 10,100,1000] [--repeat 5]
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_diff import compile_paths, json_equal
+
+try:
+    from deepdiff import DeepDiff
+except ImportError:
+    DeepDiff = None
+
+
+def make_payload(size, seed=1):
+    rnd = random.Random(seed)
+    return {
+        "status": "ok",
+        "requestId": "b5f1c2",
+        "page": {"number": 1, "size": size, "total": size * 7},
+        "items": [
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "name": f"User {i}",
+                "active": rnd.random() > 0.2,
+                "score": round(rnd.random() * 100, 3),
+                "roles": rnd.sample(["admin", "editor", "viewer", "billing", "support"], 2),
+                "address": {"city": rnd.choice(["Berlin", "Pune", "Austin"]), "zip": f"{rnd.randint(10000, 99999)}"},
+                "updatedAt": f"2024-01-{1 + i % 28:02d}T10:00:00Z",
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def cases(size):
+    base = make_payload(size)
+
+    identical = json.loads(json.dumps(base))
+
+    deep_change = copy.deepcopy(base)
+    deep_change["items"][-1]["address"]["city"] = "Lima"
+
+    reordered = copy.deepcopy(base)
+    reordered["items"].reverse()
+
+    volatile = copy.deepcopy(base)
+    volatile["requestId"] = "0000"
+    for item in volatile["items"]:
+        item["updatedAt"] = "2025-06-01T00:00:00Z"
+
+    return base, [
+        ("identical", identical, [], []),
+        ("deep change", deep_change, [], []),
+        ("reordered array", reordered, [], []),
+        ("excluded volatile fields", volatile,
+         ["root.requestId", "root.items[*].updatedAt"],
+         [r"root\['requestId'\]", r"root\['items'\]\[\d+\]\['updatedAt'\]"]),
+    ]
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated item counts per payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    if DeepDiff is None:
+        print("deepdiff is not installed; only json_equal timings are shown")
+
+    print(f"{'items':>6}  {'case':<26} {'json_equal':>11} {'DeepDiff':>11} {'speedup':>8}  agree")
+    for size in (int(x) for x in args.sizes.split(",")):
+        base, size_cases = cases(size)
+        # Same exclusions for both: our paths, and DeepDiff's exclude_regex_paths
+        for name, other, paths, deepdiff_regexes in size_cases:
+            exclude = compile_paths(paths)
+            native_time, native_equal = best_of(args.repeat, lambda: json_equal(base, other, exclude))
+
+            if DeepDiff is None:
+                print(f"{size:>6}  {name:<26} {native_time * 1000:>9.2f}ms")
+                continue
+
+            deep_time, diff = best_of(args.repeat, lambda: DeepDiff(
+                base, other, ignore_order=True, exclude_regex_paths=deepdiff_regexes))
+            agree = native_equal == (not diff)
+            print(f"{size:>6}  {name:<26} {native_time * 1000:>9.2f}ms {deep_time * 1000:>9.2f}ms "
+                  f"{deep_time / native_time:>7.1f}x  {'yes' if agree else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import time
+
+CHECKPOINT_VERSION = 2
+
+
+def campaign_fingerprint(args, param_list, start, stop):
+    """Identifies a campaign so a checkpoint is never resumed into a different one."""
+    wordlist = os.path.abspath(args.wordlist)
+    key = json.dumps([
+        args.url, args.method, args.body, list(param_list),
+        wordlist, os.path.getsize(wordlist),
+        bool(getattr(args, "combo", False)), start, stop,
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def load_checkpoint(path):
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}")
+    return state
+
+
+def write_atomic(path, state):
+    # Write-then-rename so a crash mid-write never leaves a torn checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Checkpointer:
+    """Periodically persists campaign position and counters.
+
+    Findings are already streamed to a FindingsSink, so a checkpoint only
+    records byte offsets: of that sink and of the request/response logs.
+    Resuming truncates anything written after them. Response clusters
+    (--cluster) are small and saved whole.
+    """
+
+    def __init__(self, path, fingerprint, interval=5.0, args=None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.interval = interval
+        self.args = args or {}
+        # True once path holds a checkpoint this run can be resumed from
+        self.saved = False
+
+        self._last_save = time.monotonic()
+
+    def due(self):
+        return time.monotonic() - self._last_save >= self.interval
+
+    def restore(self, state, logs=(), findings=None):
+        """Validate a loaded checkpoint and rewind the logs and findings sink to it."""
+        if state.get("fingerprint") != self.fingerprint:
+            raise ValueError("Checkpoint belongs to a different campaign (url, body, params, wordlist or range changed)")
+
+        for log, offset in zip(logs, state.get("log_offsets", [])):
+            if log is not None and offset is not None:
+                log.truncate(offset)
+
+        if findings is not None:
+            findings.truncate(state.get("findings_offset", 0))
+        self.saved = True
+
+    def save(self, next_index, stop, counters=None, request_counter=1, findings=None, logs=(), position=None,
+             clusters=None):
+        findings_offset = None
+        if findings is not None:
+            findings.flush()
+            findings_offset = findings.tell()
+
+        log_offsets = []
+        for log in logs:
+            if log is None:
+                log_offsets.append(None)
+            else:
+                log.flush()
+                log_offsets.append(log.tell())
+
+        write_atomic(self.path, {
+            "version": CHECKPOINT_VERSION,
+            "fingerprint": self.fingerprint,
+            "saved_at": time.time(),
+            "next_index": next_index,
+            "stop": stop,
+            "complete": next_index >= stop,
+            "position": position or {},
+            "counters": counters or {},
+            "request_counter": request_counter,
+            "findings_offset": findings_offset,
+            "log_offsets": log_offsets,
+            "clusters": clusters,
+            "args": self.args,
+        })
+        self._last_save = time.monotonic()
+        self.saved = True
@@ -0,0 +1,144 @@
+import sys
+import threading
+import time
+from rich import print
+from rich.markup import escape
+
+
+class CancelToken:
+    """Stops a running campaign: no new jobs are started once cancel() is called.
+
+    Requests already in flight are still handled, so findings, logs and the
+    checkpoint stay consistent.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class EventSink:
+    """What a Campaign reports while it runs; every method is a no-op here.
+
+    Methods are called on the thread driving the campaign, in job order.
+    They receive the campaign itself, so a sink can take what it needs
+    (campaign.stats(), campaign.total...) before handing data to another thread.
+    """
+
+    def progress(self, campaign, job, response=None):
+        """Before a request goes out (response None) and after its response was handled."""
+
+    def result(self, campaign, job, response, verdict):
+        """A response passed the filters; verdict has interesting, signatures, reflected, cluster."""
+
+    def finding(self, campaign, job, record):
+        """A finding record was written to the findings sink."""
+
+    def error(self, campaign, job, error):
+        """A request could not be sent."""
+
+    def notice(self, campaign, text):
+        """Something worth telling the user mid-run (e.g. a re-learned baseline)."""
+
+    def finished(self, campaign):
+        """The campaign stopped (completed or cancelled); campaign.stats() is final."""
+
+
+class ConsoleEvents(EventSink):
+    """CLI rendering: the live status line and rich-formatted results."""
+
+    def progress(self, campaign, job, response=None):
+        if response is None:
+            status_line = f"[*] {campaign.position_label(job)} | {campaign.describe(job)}"
+        else:
+            status_line = (f"[*] {campaign.position_label(job)} | Status: {response.status_code} | "
+                           f"Length: {len(response.text)} | Rate: {campaign.limiter.current_rate():.1f}/s | "
+                           f"{campaign.describe(job)}")
+        sys.stdout.write(f"\r{status_line.ljust(120)}")
+        sys.stdout.flush()
+
+    def result(self, campaign, job, response, verdict):
+        # If status matches filter-status-codes → print response permanently
+        if campaign.show_status_codes and response.status_code in campaign.show_status_codes:
+            print()
+            print(f"[cyan][*] Response Status: {response.status_code}[/cyan]")
+            print(f"[cyan][*] Response Length: {len(response.text)}[/cyan]")
+            print(f"[dim]{response.text}[/dim]\n")
+
+        if verdict["signatures"]:
+            print()
+            print(f"[red][!] Signatures matched in {campaign.position_label(job)}: "
+                  f"{escape(', '.join(verdict['signatures']))}[/red]")
+
+        if verdict["interesting"]:
+            print()
+            if campaign.combo_mode:
+                print(f"[green][+] Interesting COMBO response | Param Values: {job.values}[/green]")
+            else:
+                print(f"[green][+] Interesting response for param '{job.param}' payload '{job.payload}'[/green]")
+            details = f"    Status: {response.status_code}, Length: {len(response.text)}"
+            if verdict["reflected"]:
+                details += f", Reflected: {', '.join(verdict['reflected'])}"
+            if verdict["cluster"]:
+                details += f", Cluster: #{verdict['cluster'].id}"
+            print(details + "\n")
+
+    def error(self, campaign, job, error):
+        if campaign.combo_mode:
+            sys.stdout.write(f"\r[red][-] Error sending request Combo {job.num}/{campaign.total}: {error}[/red]\n")
+        else:
+            sys.stdout.write(f"\r[red][-] Error sending request {job.num}/{campaign.total} "
+                             f"payload '{job.payload}': {error}[/red]\n")
+        sys.stdout.flush()
+
+    def notice(self, campaign, text):
+        print(f"\n[yellow][!] {text}[/yellow]")
+
+
+class QueueEvents(EventSink):
+    """Turns events into plain (kind, data) tuples on a queue, for a GUI thread to consume.
+
+    Progress is sent as a campaign.stats() snapshot at most every
+    interval seconds; results, findings, errors and notices all go out.
+    """
+
+    def __init__(self, out_queue, interval=0.1):
+        self.queue = out_queue
+        self.interval = interval
+        self._last_progress = 0.0
+
+    def progress(self, campaign, job, response=None):
+        now = time.monotonic()
+        if now - self._last_progress >= self.interval:
+            self._last_progress = now
+            self.queue.put(("progress", campaign.stats()))
+
+    def result(self, campaign, job, response, verdict):
+        if verdict["interesting"] or verdict["signatures"]:
+            self.queue.put(("result", {
+                "num": job.num, "param": campaign.param_name(job), "payload": job.payload,
+                "status": response.status_code, "length": len(response.text),
+                "interesting": verdict["interesting"], "signatures": verdict["signatures"],
+                "reflected": verdict["reflected"],
+                "cluster": verdict["cluster"].id if verdict["cluster"] else None,
+            }))
+
+    def finding(self, campaign, job, record):
+        latency_ms = job.latency * 1000 if job.latency is not None else 0.0
+        self.queue.put(("finding", (job.num, record["param"], record["payload"], record["status"],
+                                    record["length"], latency_ms)))
+
+    def error(self, campaign, job, error):
+        self.queue.put(("error", {"num": job.num, "payload": job.payload, "error": str(error)}))
+
+    def notice(self, campaign, text):
+        self.queue.put(("notice", text))
+
+    def finished(self, campaign):
+        self.queue.put(("progress", campaign.stats()))
@@ -0,0 +1,73 @@
+import json
+import os
+
+
+def finding_record(prepared, response, param, payload):
+    """The dict stored for one response that passed the filters."""
+    record = {
+        "url": prepared.url,
+        "method": prepared.method,
+        "param": param,
+        "payload": payload,
+        "status": response.status_code,
+        "reason": response.reason,
+        "length": len(response.text),
+        "request_headers": "\n".join([f"{k}: {v}" for k, v in prepared.headers.items()]),
+        "request_body": prepared.body.decode() if isinstance(prepared.body, bytes) else prepared.body,
+        "response_headers": "\n".join([f"{k}: {v}" for k, v in response.headers.items()]),
+        "response_body": response.text[:1000],
+    }
+    if getattr(response, "truncated", False):
+        record["truncated"] = True
+    return record
+
+
+class FindingsSink:
+    """Append-only JSONL file that findings are streamed to as they are produced.
+
+    Only the record count stays in memory; reports and post-run tools read
+    the file back with read_findings(). flush()/tell()/truncate() let a
+    checkpoint record the sink offset and rewind to it on resume.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "ab", buffering=1 << 16)
+
+    def write(self, finding):
+        """Append one finding and return its byte offset in the sink."""
+        offset = self._file.tell()
+        self._file.write(json.dumps(finding).encode("utf-8") + b"\n")
+        self.count += 1
+        return offset
+
+    def flush(self):
+        self._file.flush()
+
+    def tell(self):
+        return self._file.tell()
+
+    def truncate(self, offset=0):
+        """Drop everything after offset and recount what is left."""
+        self._file.flush()
+        self._file.truncate(offset)
+        self._file.seek(0, os.SEEK_END)
+        self.count = 0
+        if offset:
+            with open(self.path, "rb") as f:
+                self.count = sum(1 for line in f if line.strip())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_findings(path):
+    """Stream findings back from a sink file, one dict at a time."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
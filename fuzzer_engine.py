@@ -1,18 +1,501 @@
-import requests
 import time
 import os
 import sys
-import itertools
-from baseline_analyzer import is_interesting
+import argparse
+import multiprocessing
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from baseline_analyzer import Baseline
+from payload_space import ComboSpace
+from payload_encoding import PayloadEncoder
+from request_template import RequestTemplate, find_placeholders, param_json_paths
+from json_diff import compile_paths
+from wordlist import Wordlist
+from checkpoint import Checkpointer, campaign_fingerprint, load_checkpoint
+from rate_limiter import RateLimiter
+from findings_sink import FindingsSink, finding_record, read_findings
+import log_writer
+from log_writer import LogWriter, format_request, format_response, merge_logs
+from results_db import ResultsDB
+from response_archive import ResponseArchive
+from response_clusters import ClusterIndex, load_clusters
+from signatures import INCLUDE_REGEX, SignatureMatcher
+from reflection import find_reflections, parse_forms
+from engine_events import CancelToken, ConsoleEvents
 from rich import print
+from rich.markup import escape
+from rich.table import Table
 from report_generator import generate_html_report
-from request_utils import prepare_and_send_request
-import re
+from request_utils import Transport, prepare_and_send_request
 import json
 #from file_fuzzer import run_file_fuzzer
 
 
-def run_fuzzer(args, param_list):
+class FuzzJob:
+    """One request of a campaign: the payload values and the rendered URL/body."""
+
+    def __init__(self, num, param, values, url, body, headers):
+        self.num = num          # 1-based position in the campaign
+        self.param = param      # fuzzed param in independent mode, None in combo mode
+        self.values = values    # {param: payload} sent with this request
+        self.url = url
+        self.body = body        # rendered bytes
+        self.headers = headers
+        self.latency = None     # seconds until the response, once sent
+
+    @property
+    def payload(self):
+        return self.values[self.param] if self.param else str(tuple(self.values.values()))
+
+
+class Campaign:
+    """Shared state of a fuzzing run, consumed by every engine.
+
+    Engines only decide how requests are dispatched; filtering, logging,
+    baseline diffing and findings live here so every engine reports the same.
+    Responses must be handed to process()/fail() in job order.
+
+    Front-ends plug in through events (an EventSink, ConsoleEvents for the
+    CLI), stop a run with cancel (a CancelToken) and poll stats().
+    """
+
+    def __init__(self, args, param_list, payloads, headers, proxies, transport,
+                 baseline, result_dir, label=None, quiet=False, log_part=None,
+                 checkpointer=None, events=None, cancel=None):
+        self.args = args
+        self.param_list = param_list
+        self.payloads = payloads
+        self.headers = headers
+        self.proxies = proxies
+        self.transport = transport
+        # Learned once by run_fuzzer (see learn_baseline), shared by every shard
+        self.baseline = baseline
+        self.baseline_refresh = getattr(args, "baseline_refresh", 0) or 0
+        self._last_refresh = time.monotonic()
+        self.result_dir = result_dir
+        self.label = label      # e.g. "worker 2/4", tags log records of sharded runs
+        self.quiet = quiet      # no live status line (worker processes)
+        self.checkpointer = checkpointer
+        self.events = events or ConsoleEvents()
+        self.cancel = cancel or CancelToken()
+        # Paces every engine; --adaptive backs off on 429/503 and slow responses
+        self.limiter = RateLimiter.from_args(args)
+        # Bodies are capped at --max-body-bytes, or not read at all with --status-only
+        self.max_body_bytes = getattr(args, "max_body_bytes", None) or None
+        self.read_body = not getattr(args, "status_only", False)
+
+        #Regexing: --include-regex and --signatures share one precompiled matcher
+        self.include_regex = args.include_regex if hasattr(args, "include_regex") else None
+        self.matcher = SignatureMatcher.from_args(args)
+        # --reflected keeps only responses echoing their payload in one of these forms
+        self.reflected_forms = parse_forms(args.reflected) if getattr(args, "reflected", None) else None
+
+        # Open request/response logs if needed; worker processes write their own part files
+        suffix = f".{log_part}" if log_part else ""
+        self.requests_log = None
+        self.responses_log = None
+        if args.save_request:
+            self.requests_log = open_log(args, os.path.join(result_dir, f"requests{suffix}.txt"))
+        if args.save_response:
+            self.responses_log = open_log(args, os.path.join(result_dir, f"responses{suffix}.txt"))
+        # --save: interesting responses go to one archive, identical bodies stored once
+        self.archive = ResponseArchive(os.path.join(result_dir, f"saved{suffix}")) if args.save else None
+        # Findings are streamed to disk, never accumulated in memory
+        self.findings = FindingsSink(os.path.join(result_dir, f"findings{suffix}.jsonl"))
+        # Optional queryable copy of every filtered request/response
+        self.db = ResultsDB(args.db) if getattr(args, "db", None) else None
+        # Near-duplicate responses collapse into clusters; only the first --cluster of each are kept
+        self.clusters = None
+        if getattr(args, "cluster", 0):
+            self.clusters = ClusterIndex(args.cluster, getattr(args, "cluster_distance", 6))
+        self.clusters_path = os.path.join(result_dir, f"clusters{suffix}.json")
+
+        # Parse status code filters
+        self.show_status_codes = set()
+        self.hide_status_codes = set()
+
+        if args.filter_status_codes:
+            self.show_status_codes = set(int(x.strip()) for x in args.filter_status_codes.split(",") if x.strip())
+
+        if args.hide_status_codes:
+            self.hide_status_codes = set(int(x.strip()) for x in args.hide_status_codes.split(",") if x.strip())
+
+        self.combo_mode = hasattr(args, "combo") and args.combo
+        self.combo_space = ComboSpace([payloads] * len(param_list)) if self.combo_mode else None
+        # Payloads are escaped for the spot they land in unless --raw-payloads
+        self.encoder = PayloadEncoder(enabled=not getattr(args, "raw_payloads", False))
+        self.template = RequestTemplate(args.url, args.body, headers, param_list, self.encoder)
+        self.request_counter = 1  # For request/response numbering
+        self.counters = {"sent": 0, "errors": 0, "matched": 0, "interesting": 0, "signatures": 0, "reflected": 0}
+        self.total = campaign_size(param_list, payloads, self.combo_mode)
+        self.start = 0          # first global index of this run (before any resume)
+        self.next_index = 0     # global index of the first job not yet handled
+        self.handling = False   # True while a job's output is being written
+        self.stop = self.total
+        self.started = time.monotonic()
+
+    def jobs(self, start=0, stop=None):
+        """Yield the jobs with global indexes in [start, stop), until cancelled."""
+        stop = self.total if stop is None else min(stop, self.total)
+        template = self.template
+        cancel = self.cancel
+
+        if self.combo_mode:
+            # === COMBO MODE === (Cluster Bomb style)
+            for num, combo in enumerate(self.combo_space.iter_range(start, stop), start + 1):
+                if cancel.cancelled:
+                    return
+                fuzzed_url, fuzzed_body, headers = template.render(combo)
+                yield FuzzJob(num, None, dict(zip(self.param_list, combo)), fuzzed_url, fuzzed_body, headers)
+            return
+
+        # === INDEPENDENT PARAM FUZZING ===
+        # Global index = param index * len(payloads) + payload index
+        for index in range(start, stop):
+            if cancel.cancelled:
+                return
+            param_index, payload_index = divmod(index, len(self.payloads))
+            param = self.param_list[param_index]
+            payload = self.payloads[payload_index]
+
+            # Other params keep a fixed placeholder value
+            values = ["BASELINE_VALUE"] * len(self.param_list)
+            values[param_index] = payload
+            fuzzed_url, fuzzed_body, headers = template.render(values)
+
+            yield FuzzJob(index + 1, param, {param: payload}, fuzzed_url, fuzzed_body, headers)
+
+    def close(self):
+        # Close logs
+        self.findings.close()
+        if self.clusters is not None:
+            self.clusters.save(self.clusters_path)
+        if self.db:
+            self.db.close()
+        if self.archive:
+            self.archive.close()
+        if self.requests_log:
+            self.requests_log.close()
+        if self.responses_log:
+            self.responses_log.close()
+
+    def position_label(self, job):
+        if self.combo_mode:
+            return f"Combo {job.num}/{self.total}"
+        return f"Request {job.num}/{self.total}"
+
+    def describe(self, job):
+        if self.combo_mode:
+            return f"Param Values: {job.values}"
+        return f"Param: {job.param} | Payload: '{job.payload}'"
+
+    def param_name(self, job):
+        return " & ".join(self.param_list) if self.combo_mode else job.param
+
+    def stats(self):
+        """Snapshot of the run so far: counters, progress, rate; a plain dict, safe to pass between threads."""
+        return dict(self.counters,
+                    done=self.next_index - self.start,
+                    total=self.stop - self.start,
+                    findings=self.findings.count,
+                    rate=self.limiter.current_rate(),
+                    elapsed=time.monotonic() - self.started,
+                    cancelled=self.cancel.cancelled)
+
+    def announce(self, job):
+        # Live status line before the request goes out
+        if not self.quiet:
+            self.events.progress(self, job)
+
+    def send(self, job):
+        # Called from worker threads too; the limiter is thread-safe
+        self.limiter.acquire()
+        started = time.monotonic()
+        try:
+            prepared, response = prepare_and_send_request(self.args.method, job.url, data=job.body, headers=job.headers,
+                                                          proxies=self.proxies, transport=self.transport)
+        except Exception:
+            self.limiter.observe(None, time.monotonic() - started)
+            raise
+        job.latency = time.monotonic() - started
+        self.limiter.observe(response.status_code, job.latency, response.headers.get("Retry-After"))
+        return prepared, response
+
+    def fail(self, job, error):
+        self.handling = True
+        self._fail(job, error)
+        self._advance(job)
+
+    def process(self, job, prepared, response):
+        self.handling = True
+        if self.baseline_due():
+            self.refresh_baseline(self.sample_baseline())
+        self._process(job, prepared, response)
+        self._advance(job)
+
+    def baseline_due(self):
+        return self.baseline_refresh and time.monotonic() - self._last_refresh >= self.baseline_refresh
+
+    def sample_baseline(self):
+        """Re-send the baseline request (blocking); None if it failed."""
+        self._last_refresh = time.monotonic()
+        try:
+            _, response = prepare_and_send_request(self.args.method, self.args.url, data=self.args.body, headers=self.headers,
+                                                   proxies=self.proxies, transport=self.transport)
+        except Exception:
+            return None
+        return response
+
+    def refresh_baseline(self, response):
+        # A drifted baseline re-learns its mask
+        if response is None:
+            return
+        baseline = self.baseline.refresh(response.status_code, response.text, dict(response.headers))
+        if baseline is not None:
+            self.baseline = baseline
+            if not self.quiet:
+                self.events.notice(self, f"Baseline drifted, re-learned volatile fields: {describe_mask(baseline.mask)}")
+
+    def _advance(self, job):
+        # Jobs are handled in order, so everything before next_index is done
+        self.next_index = job.num
+        self.handling = False
+        if self.checkpointer and self.checkpointer.due():
+            self.save_checkpoint()
+
+    def position(self, index):
+        if self.combo_mode:
+            return {"combo_index": index}
+        param_index, payload_index = divmod(index, len(self.payloads)) if self.payloads else (0, 0)
+        return {"param_index": param_index, "payload_index": payload_index}
+
+    def save_checkpoint(self):
+        # Rows the checkpoint counts as done must be on disk first
+        if self.db:
+            self.db.flush()
+        self.checkpointer.save(
+            self.next_index, self.stop,
+            counters=self.counters,
+            request_counter=self.request_counter,
+            findings=self.findings,
+            logs=(self.requests_log, self.responses_log, self.archive),
+            position=self.position(self.next_index),
+            clusters=self.clusters.state() if self.clusters is not None else None,
+        )
+
+    def _status_line(self, job, response):
+        if not self.quiet:
+            self.events.progress(self, job, response)
+
+    def _fail(self, job, error):
+        self.counters["errors"] += 1
+        self.events.error(self, job, error)
+
+    def _process(self, job, prepared, response):
+        args = self.args
+        self.counters["sent"] += 1
+
+        # One pass over the raw body finds every signature
+        hits = self.matcher.scan(response.content) if self.matcher else []
+        if self.include_regex and INCLUDE_REGEX not in hits:
+            return
+        signatures = [name for name in hits if name != INCLUDE_REGEX]
+
+        resp_status = response.status_code
+
+        # Skip unwanted responses
+        if self.show_status_codes and resp_status not in self.show_status_codes:
+            return
+
+        if self.hide_status_codes and resp_status in self.hide_status_codes:
+            return
+
+        # Payload echoes, raw or encoded (cheap substring checks, always on)
+        reflected = find_reflections(response.content, job.values.values())
+        if self.reflected_forms and not self.reflected_forms.intersection(reflected):
+            return
+
+        self.counters["matched"] += 1
+
+        # Baseline diffing
+        status_changed, body_changed = self.baseline.compare(
+            response.status_code, response.text,
+            current_param=job.param,
+            content_hash=getattr(response, "content_hash", None)
+        )
+
+        interesting = status_changed or body_changed
+        if interesting:
+            self.counters["interesting"] += 1
+        if signatures:
+            self.counters["signatures"] += 1
+        if reflected:
+            self.counters["reflected"] += 1
+
+        # Responses shaped like ones already kept are only counted
+        cluster = None
+        if self.clusters is not None:
+            cluster, keep = self.clusters.add(resp_status, interesting, response.text, job.values.values(),
+                                              num=job.num, payload=job.payload)
+            if not keep:
+                self._status_line(job, response)
+                return
+
+        record_id = f"{self.request_counter} [{self.label}]" if self.label else self.request_counter
+
+        # Save request/response → only matching responses reach this point!
+        # Records are formatted and written by the log writer threads
+        if self.requests_log:
+            self.requests_log.write(format_request, record_id, args.method, job.url,
+                                    list(job.headers.items()), job.body)
+
+        if self.responses_log:
+            truncated_at = len(response.content) if getattr(response, "truncated", False) else None
+            self.responses_log.write(format_response, record_id, response.status_code, response.reason,
+                                     list(response.headers.items()), response.text, truncated_at)
+
+        self.request_counter += 1
+
+        # Update status line after response
+        self._status_line(job, response)
+
+        self.events.result(self, job, response, {"interesting": interesting, "signatures": signatures,
+                                                  "reflected": reflected, "cluster": cluster})
+
+        param = self.param_name(job)
+        if interesting and self.archive:
+            self.archive.add(job.num, param, job.payload, response.status_code, response.reason,
+                             list(response.headers.items()), response.content,
+                             getattr(response, "content_hash", None))
+
+        record = finding_record(prepared, response, param, job.payload)
+        if cluster:
+            record["cluster"] = cluster.id
+        if signatures:
+            record["signatures"] = signatures
+        if reflected:
+            record["reflected"] = reflected
+        self.findings.write(record)
+        self.events.finding(self, job, record)
+        if self.db:
+            self.db.add(job.num, job.values, prepared, response, interesting)
+
+
+def sample_baseline(args, headers, proxies, transport):
+    # The same baseline request K times, to learn what varies on its own
+    samples = []
+    for _ in range(max(1, getattr(args, "baseline_samples", 1) or 1)):
+        _, response = prepare_and_send_request(args.method, args.url, data=args.body, headers=headers,
+                                               proxies=proxies, transport=transport)
+        samples.append((response.status_code, response.text, dict(response.headers)))
+    return samples
+
+
+def learn_baseline(args, param_list, samples):
+    # Diff ignores --ignore-paths, fields that vary between baseline samples
+    # and wherever the fuzzed param sits in the body
+    return Baseline.learn(samples, ignore_paths=ignore_paths(args),
+                          param_paths=param_json_paths(args.body, param_list))
+
+
+def describe_mask(mask):
+    parts = []
+    if mask.paths:
+        parts.append(f"JSON paths {', '.join(mask.paths)}")
+    if mask.headers:
+        parts.append(f"headers {', '.join(mask.headers)}")
+    if mask.anchors:
+        parts.append(f"{len(mask.anchors)} text regions")
+    return "; ".join(parts) or "none"
+
+
+def open_log(args, path):
+    # --log-compress / --log-segment-mb apply to both request and response logs
+    segment_mb = getattr(args, "log_segment_mb", None)
+    return LogWriter(path, compress=getattr(args, "log_compress", None),
+                     segment_bytes=int(segment_mb * (1 << 20)) if segment_mb else None)
+
+
+def ignore_paths(args):
+    return [p.strip() for p in (getattr(args, "ignore_paths", None) or "").split(",") if p.strip()]
+
+
+def campaign_size(param_list, payloads, combo_mode):
+    if combo_mode:
+        return ComboSpace([payloads] * len(param_list)).size
+    return len(payloads) * len(param_list)
+
+
+def parse_shard(spec):
+    """Parse a 1-based "i/N" --shard spec into (i, N)."""
+    try:
+        index, count = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid --shard '{spec}', expected i/N (e.g. 2/4)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid --shard '{spec}', i must be between 1 and N")
+    return index, count
+
+
+def shard_range(start, stop, index, count):
+    """Deterministic contiguous slice [lo, hi) of [start, stop) for 1-based shard index of count."""
+    size = stop - start
+    return start + size * (index - 1) // count, start + size * index // count
+
+
+def run_sync_engine(campaign, start=0, stop=None):
+    # Strictly serial: one blocking request at a time, paced by the rate limiter
+    for job in campaign.jobs(start, stop):
+        campaign.announce(job)
+
+        try:
+            prepared, response = campaign.send(job)
+        except Exception as e:
+            campaign.fail(job, e)
+            continue
+
+        campaign.process(job, prepared, response)
+
+
+def _send_threaded(campaign, job):
+    try:
+        prepared, response = campaign.send(job)
+        return (job, prepared, response, None)
+    except Exception as e:
+        return (job, None, None, e)
+
+
+def run_threaded_engine(campaign, threads, start=0, stop=None):
+    # Workers only send; results are consumed here in job order, so output
+    # files stay stable and the Campaign is never touched concurrently.
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        pending = deque()
+
+        def finish(result):
+            job, prepared, response, error = result
+            if error is not None:
+                campaign.fail(job, error)
+            else:
+                campaign.process(job, prepared, response)
+
+        for job in campaign.jobs(start, stop):
+            pending.append(pool.submit(_send_threaded, campaign, job))
+            # Bounded queue: never more than 2x threads jobs materialised
+            if len(pending) >= threads * 2:
+                finish(pending.popleft().result())
+
+        while pending:
+            finish(pending.popleft().result())
+
+
+def run_fuzzer(args, param_list, events=None, cancel=None):
+    """Run a whole campaign and return its counters.
+
+    events (an EventSink, ConsoleEvents by default) receives progress,
+    results, findings and errors; cancel (a CancelToken) stops it early.
+    Setup messages and the final summary are printed.
+    """
 
     #Ensures param validation logic like len(args.params) behaves correctly
     if isinstance(args.params, str):
@@ -28,16 +511,8 @@ def run_fuzzer(args, param_list):
         print("[yellow][!] Multiple parameters specified. Use --combo for multi-param fuzzing.[/yellow]")
         sys.exit(1)
 
-    #Regexing
-    include_regex = args.include_regex if hasattr(args, "include_regex") else None
-
-    #Declare findings for report
-    findings = []
-
-
-    # Load wordlist
-    with open(args.wordlist, "r") as f:
-        payloads = [line.strip() for line in f if line.strip()]
+    # Map the wordlist; payloads are read on demand by index
+    payloads = Wordlist(args.wordlist)
 
     headers = {"Content-Type": "application/json"}
 
@@ -56,6 +531,74 @@ def run_fuzzer(args, param_list):
     if hasattr(args, "headers") and isinstance(args.headers, dict):
         headers.update(args.headers)
 
+    # Placeholders not listed in params would be sent literally
+    placeholders = find_placeholders(args.url) | find_placeholders(args.body)
+    for value in headers.values():
+        placeholders |= find_placeholders(value)
+    unknown = sorted(placeholders - set(param_list))
+    if unknown:
+        print(f"[yellow][!] Placeholders not in params are sent as-is: {', '.join(unknown)}[/yellow]")
+
+
+    try:
+        compile_paths(ignore_paths(args))
+    except ValueError as e:
+        print(f"[red][-] --ignore-paths: {e}[/red]")
+        sys.exit(1)
+
+    try:
+        matcher = SignatureMatcher.from_args(args)
+    except (OSError, ValueError) as e:
+        print(f"[red][-] --include-regex/--signatures: {e}[/red]")
+        sys.exit(1)
+    if getattr(args, "log_compress", None) == "zstd" and log_writer.zstandard is None:
+        print("[red][-] --log-compress zstd needs the zstandard package (pip install zstandard)[/red]")
+        sys.exit(1)
+    if getattr(args, "engine", "sync") == "async":
+        from async_engine import aiohttp
+        if aiohttp is None:
+            print("[red][-] --engine async requires aiohttp (pip install aiohttp)[/red]")
+            sys.exit(1)
+        if (getattr(args, "threads", 1) or 1) > 1:
+            print("[yellow][!] --threads only applies to the sync engine. Use --concurrency with --engine async.[/yellow]")
+            sys.exit(1)
+    if getattr(args, "adaptive", False) and not RateLimiter.from_args(args).rate:
+        print("[yellow][!] --adaptive needs a rate to start from: set --rate, or a --delay above 0.[/yellow]")
+        sys.exit(1)
+    workers = getattr(args, "workers", 1) or 1
+    if workers > 1 and (events is not None or cancel is not None):
+        # Worker processes report to the console only and cannot be stopped early
+        print("[yellow][!] --workers needs the CLI. Run one process here, or use --shard i/N.[/yellow]")
+        sys.exit(1)
+    if workers > 1 and (getattr(args, "checkpoint", None) or getattr(args, "resume", None)):
+        print("[yellow][!] --checkpoint/--resume need a single process. Use --shard i/N per process instead of --workers.[/yellow]")
+        sys.exit(1)
+    shard = None
+    if getattr(args, "shard", None):
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"[red][-] {e}[/red]")
+            sys.exit(1)
+
+    if getattr(args, "status_only", False):
+        needs_body = [flag for flag, value in (("--include-regex", getattr(args, "include_regex", None)),
+                                               ("--signatures", getattr(args, "signatures", None)),
+                                               ("--reflected", getattr(args, "reflected", None))) if value]
+        if needs_body:
+            print(f"[red][-] --status-only does not read bodies, it cannot be combined with {', '.join(needs_body)}[/red]")
+            sys.exit(1)
+        print("[cyan][*] Status-only mode: response bodies are not read[/cyan]")
+
+    try:
+        if getattr(args, "reflected", None):
+            parse_forms(args.reflected)
+    except ValueError as e:
+        print(f"[red][-] --reflected: {e}[/red]")
+        sys.exit(1)
+
+    if matcher and getattr(args, "signatures", None):
+        print(f"[cyan][*] Scanning responses for {len(matcher.names)} patterns[/cyan]")
 
     # Setup proxy if provided
     proxies = None
@@ -66,287 +609,326 @@ def run_fuzzer(args, param_list):
     }
     print(f"[cyan][*] Using proxy: {args.proxy}[/cyan]")
 
-    # Send baseline request
+    # One pooled keep-alive transport for the whole campaign
+    transport = Transport.from_args(args, proxies=proxies)
+
+    # Send baseline request(s)
     print("[cyan][*] Sending baseline request...[/cyan]")
-    prepared,baseline_response = prepare_and_send_request(args.method, args.url, data=args.body, headers=headers,proxies=proxies)
-    baseline_status = baseline_response.status_code
-    baseline_text = baseline_response.text
+    samples = sample_baseline(args, headers, proxies, transport)
+    baseline_status, baseline_text, _ = samples[-1]
 
-    print(f"[cyan][*] Baseline status: {baseline_status}, length: {len(baseline_text)}[/cyan]\n")
+    print(f"[cyan][*] Baseline status: {baseline_status}, length: {len(baseline_text)}[/cyan]")
+    baseline = learn_baseline(args, param_list, samples)
+    if len(samples) > 1:
+        print(f"[cyan][*] Volatile across {len(samples)} baseline samples: {describe_mask(baseline.mask)}[/cyan]")
+    print()
 
     # Prepare results dir
     result_dir = "results"
     if not os.path.exists(result_dir):
         os.makedirs(result_dir)
 
-    # Open request/response logs if needed
-    requests_log = None
-    responses_log = None
-    if args.save_request:
-        requests_log = open(os.path.join(result_dir, "requests.txt"), "a")
-    if args.save_response:
-        responses_log = open(os.path.join(result_dir, "responses.txt"), "a")
-
-    request_counter = 1  # For request/response numbering
-
-    # Parse status code filters
-    show_status_codes = set()
-    hide_status_codes = set()
-
-    if args.filter_status_codes:
-        show_status_codes = set(int(x.strip()) for x in args.filter_status_codes.split(",") if x.strip())
-
-    if args.hide_status_codes:
-        hide_status_codes = set(int(x.strip()) for x in args.hide_status_codes.split(",") if x.strip())
     # Detect combo mode
     combo_mode = hasattr(args, "combo") and args.combo
-
     if combo_mode:
-        # === COMBO MODE ===
-
         print(f"[cyan][*] Running in COMBO mode (Cluster Bomb style)[/cyan]\n")
 
-        # Build param → payload list
-        param_payload_lists = {param: payloads for param in param_list}
-
-        # Build all combinations
-        all_combos = list(itertools.product(*param_payload_lists.values()))
-        param_order = list(param_payload_lists.keys())
-
-        total_combos = len(all_combos)
-        current_combo_num = 1
-
-        for combo in all_combos:
-            # Build fuzzed body
-            fuzzed_body = args.body
-            for i, param in enumerate(param_order):
-                placeholder = f"<<FUZZ_{param}>>"
-                fuzzed_body = fuzzed_body.replace(placeholder, combo[i])
-
-            # Build fuzzed URL
-            fuzzed_url = args.url
-            for i, param in enumerate(param_order):
-                fuzzed_url = fuzzed_url.replace(f"<<FUZZ_{param}>>", combo[i])
-
-            # Live status line
-            status_line = f"[*] Combo {current_combo_num}/{total_combos} | Param Values: {dict(zip(param_order, combo))}"
-            sys.stdout.write(f"\r{status_line.ljust(120)}")
-            sys.stdout.flush()
-
-            # Send request
+    # Restrict to this machine's slice of the payload space
+    start, stop = 0, campaign_size(param_list, payloads, combo_mode)
+    shard_label = None
+    if shard:
+        start, stop = shard_range(start, stop, *shard)
+        shard_label = f"shard {shard[0]}/{shard[1]}"
+        print(f"[cyan][*] {shard_label}: requests {start + 1}-{stop}[/cyan]\n")
+
+    # A fresh campaign starts from an empty results store; --resume keeps it
+    if getattr(args, "db", None) and not getattr(args, "resume", None):
+        with ResultsDB(args.db) as db:
+            db.reset({"url": args.url, "method": args.method, "params": ",".join(param_list),
+                      "baseline_status": baseline_status, "baseline_length": len(baseline_text)})
+
+    # Periodic checkpoints, and --resume from one
+    checkpointer = None
+    resume_state = None
+    checkpoint_path = getattr(args, "checkpoint", None) or getattr(args, "resume", None)
+    if checkpoint_path:
+        if getattr(args, "resume", None):
             try:
-                prepared,response = prepare_and_send_request(args.method, fuzzed_url, data=fuzzed_body, headers=headers, proxies=proxies)
-                if include_regex:
-                          if not re.search(include_regex, response.text, re.IGNORECASE):
-                              current_request_num += 1
-                              continue
-            except Exception as e:
-                sys.stdout.write(f"\r[red][-] Error sending request Combo {current_combo_num}/{total_combos}: {e}[/red]\n")
-                sys.stdout.flush()
-                current_combo_num += 1
-                continue
-
-            resp_status = response.status_code
-
-            # Skip unwanted responses
-            if show_status_codes and resp_status not in show_status_codes:
-                current_combo_num += 1
+                resume_state = load_checkpoint(args.resume)
+            except (OSError, ValueError) as e:
+                print(f"[red][-] Cannot resume from {args.resume}: {e}[/red]")
+                sys.exit(1)
+        checkpointer = Checkpointer(
+            checkpoint_path,
+            campaign_fingerprint(args, param_list, start, stop),
+            interval=getattr(args, "checkpoint_interval", 5.0) or 5.0,
+            args=checkpoint_args(args),
+        )
+
+    if workers > 1:
+        transport.close()
+        try:
+            counters = _run_workers(args, param_list, headers, proxies, baseline,
+                                    result_dir, start, stop, workers, shard_label)
+        except KeyboardInterrupt:
+            print("\n[yellow][!] Interrupted. Worker output was not merged, it is left in the "
+                  f"per-worker files of {result_dir}/.[/yellow]")
+            sys.exit(130)
+    else:
+        try:
+            counters = _run_shard(args, param_list, payloads, headers, proxies, transport,
+                                  baseline, result_dir, start, stop, shard_label,
+                                  checkpointer=checkpointer, resume_state=resume_state,
+                                  events=events, cancel=cancel)
+        except KeyboardInterrupt:
+            print("\n[yellow][!] Interrupted.[/yellow]")
+            # Stopped mid-job before the first periodic save: nothing to resume from yet
+            if checkpointer and checkpointer.saved:
+                print(f"[cyan][*] Continue with --resume {checkpointer.path}[/cyan]")
+            sys.exit(130)
+        transport.close()
+    payloads.close()
+
+    if cancel and cancel.cancelled:
+        print("\n[yellow][!] Stopped before the end of the campaign.[/yellow]")
+        if checkpointer and checkpointer.saved:
+            print(f"[cyan][*] Continue with --resume {checkpointer.path}[/cyan]")
+
+    print(f"\n[cyan][*] Done: {counters['sent']} responses, {counters['errors']} errors, "
+          f"{counters['matched']} matched filters, {counters['interesting']} interesting[/cyan]")
+    if getattr(args, "signatures", None):
+        print(f"[cyan][*] {counters['signatures']} responses matched signatures[/cyan]")
+    if counters["reflected"]:
+        print(f"[cyan][*] {counters['reflected']} responses reflected their payload[/cyan]")
+
+    findings_path = os.path.join(result_dir, "findings.jsonl")
+    print(f"[cyan][*] Findings written to {findings_path}[/cyan]")
+
+    clusters = None
+    if getattr(args, "cluster", 0):
+        clusters = load_clusters(os.path.join(result_dir, "clusters.json"))
+        print_clusters(clusters)
+
+    if getattr(args, "db", None):
+        print(f"[cyan][*] Results stored in {args.db} (query with: python api_fuzzer.py query {args.db} --help)[/cyan]")
+
+    if hasattr(args, "report") and args.report and counters["matched"]:
+        generate_html_report(read_findings(findings_path), os.path.join("results", args.report), clusters=clusters)
+
+    return counters
+
+
+def _run_shard(args, param_list, payloads, headers, proxies, transport,
+               baseline, result_dir, start, stop, label=None, quiet=False, log_part=None,
+               checkpointer=None, resume_state=None, events=None, cancel=None):
+    campaign = Campaign(
+        args, param_list, payloads, headers, proxies, transport,
+        baseline, result_dir, label=label, quiet=quiet, log_part=log_part,
+        checkpointer=checkpointer, events=events, cancel=cancel,
+    )
+    campaign.start = start
+    campaign.stop = stop
+
+    if resume_state:
+        try:
+            checkpointer.restore(resume_state, (campaign.requests_log, campaign.responses_log, campaign.archive),
+                                 campaign.findings)
+            if campaign.db:
+                campaign.db.discard_after(resume_state["next_index"])
+        except ValueError as e:
+            campaign.close()
+            print(f"[red][-] {e}[/red]")
+            sys.exit(1)
+        start = resume_state["next_index"]
+        campaign.counters.update(resume_state.get("counters", {}))
+        campaign.request_counter = resume_state.get("request_counter", 1)
+        if campaign.clusters is not None:
+            campaign.clusters = ClusterIndex.from_state(resume_state.get("clusters"), campaign.clusters.exemplars,
+                                                        campaign.clusters.distance)
+        print(f"[cyan][*] Resuming at request {start + 1}/{stop} with {campaign.findings.count} findings restored[/cyan]\n")
+    else:
+        # A fresh run starts a fresh findings sink (and --save archive)
+        campaign.findings.truncate(0)
+        if campaign.archive:
+            campaign.archive.truncate()
+    campaign.next_index = start
+
+    engine = getattr(args, "engine", "sync") or "sync"
+    threads = getattr(args, "threads", 1) or 1
+
+    try:
+        if engine == "async":
+            from async_engine import run_async_engine
+            concurrency = getattr(args, "concurrency", 10) or 10
+            if not quiet:
+                print(f"[cyan][*] Async engine with {concurrency} requests in flight[/cyan]\n")
+            run_async_engine(campaign, concurrency, start, stop)
+        elif threads > 1:
+            if not quiet:
+                print(f"[cyan][*] Thread pool with {threads} workers[/cyan]\n")
+            run_threaded_engine(campaign, threads, start, stop)
+        else:
+            run_sync_engine(campaign, start, stop)
+    finally:
+        # Interrupted halfway through a job: the last periodic checkpoint is the consistent one
+        if checkpointer and not campaign.handling:
+            campaign.save_checkpoint()
+        campaign.close()
+        if not quiet:
+            campaign.events.finished(campaign)
+
+    return campaign.counters
+
+
+def _args_snapshot(args):
+    # SwaggerArgs / GUI Args are ad-hoc classes that cannot be pickled into a worker
+    return argparse.Namespace(**{k: getattr(args, k) for k in dir(args) if not k.startswith("_")})
+
+
+# Never written to a checkpoint in clear; --resume asks for them again
+SECRET_ARGS = ("auth_header", "headers")
+REDACTED = "<redacted>"
+
+
+def checkpoint_args(args):
+    # JSON-friendly copy of the campaign arguments, so --resume alone can restart it
+    snapshot = {}
+    for key, value in vars(_args_snapshot(args)).items():
+        if key in SECRET_ARGS and value:
+            snapshot[key] = REDACTED
+        elif isinstance(value, (str, int, float, bool, list, dict, type(None))):
+            snapshot[key] = value
+    return snapshot
+
+
+def resumable_checkpoint(args, param_list):
+    """True if args.checkpoint holds an unfinished checkpoint of this very campaign."""
+    path = getattr(args, "checkpoint", None)
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        state = load_checkpoint(path)
+        with Wordlist(args.wordlist) as payloads:
+            start, stop = 0, campaign_size(param_list, payloads, bool(getattr(args, "combo", False)))
+        if getattr(args, "shard", None):
+            start, stop = shard_range(start, stop, *parse_shard(args.shard))
+        fingerprint = campaign_fingerprint(args, param_list, start, stop)
+    except (OSError, ValueError):
+        return False
+    return not state.get("complete") and state.get("fingerprint") == fingerprint
+
+
+def _shard_worker(args, param_list, headers, proxies, baseline,
+                  result_dir, start, stop, label):
+    # Runs in a child process: its own wordlist mapping, transport and engine
+    try:
+        with Wordlist(args.wordlist) as payloads, Transport.from_args(args, proxies=proxies) as transport:
+            return _run_shard(args, param_list, payloads, headers, proxies, transport,
+                              baseline, result_dir, start, stop, label,
+                              quiet=True, log_part=_part_name(label))
+    except KeyboardInterrupt:
+        # Ctrl+C reaches every process of the group; the parent reports it
+        return None
+
+
+def _run_workers(args, param_list, headers, proxies, baseline,
+                 result_dir, start, stop, workers, shard_label=None):
+    print(f"[cyan][*] Splitting requests {start + 1}-{stop} across {workers} worker processes[/cyan]\n")
+
+    snapshot = _args_snapshot(args)
+    # Each process gets its share of an overall --rate; a --delay paces each
+    # thread/slot, so every process derives its own rate from it
+    snapshot.rate = args.rate / workers if getattr(args, "rate", None) else None
+    snapshot.max_rate = args.max_rate / workers if getattr(args, "max_rate", None) else None
+    labels = []
+    futures = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for index in range(1, workers + 1):
+            lo, hi = shard_range(start, stop, index, workers)
+            if lo == hi:
                 continue
+            label = f"worker {index}/{workers}"
+            if shard_label:
+                label = f"{shard_label} {label}"
+            labels.append(label)
+            futures.append(pool.submit(_shard_worker, snapshot, param_list, headers, proxies,
+                                       baseline, result_dir, lo, hi, label))
+
+        # Merge in shard order so findings and logs keep the campaign order
+        counters = {"sent": 0, "errors": 0, "matched": 0, "interesting": 0, "signatures": 0, "reflected": 0}
+        for label, future in zip(labels, futures):
+            shard_counters = future.result()
+            for key, value in shard_counters.items():
+                counters[key] += value
+            print(f"[cyan][*] {label} finished: {shard_counters['sent']} responses, "
+                  f"{shard_counters['interesting']} interesting[/cyan]")
+
+    for name, enabled in (("requests", args.save_request), ("responses", args.save_response)):
+        if enabled:
+            merge_logs(os.path.join(result_dir, f"{name}.txt"),
+                       [os.path.join(result_dir, f"{name}.{_part_name(label)}.txt") for label in labels],
+                       compress=getattr(args, "log_compress", None), rotate=bool(getattr(args, "log_segment_mb", None)))
+    if args.save:
+        with ResponseArchive(os.path.join(result_dir, "saved")) as archive:
+            archive.truncate()
+            for label in labels:
+                part = os.path.join(result_dir, f"saved.{_part_name(label)}")
+                if os.path.exists(part + ".index"):
+                    archive.merge(part)
+                    os.remove(part + ".index")
+                    os.remove(part + ".data")
+    if getattr(args, "cluster", 0):
+        _merge_part_clusters(result_dir, labels, args)
+    else:
+        _merge_part_logs(result_dir, "findings", labels, ext="jsonl", mode="w")
 
-            if hide_status_codes and resp_status in hide_status_codes:
-                current_combo_num += 1
-                continue
+    return counters
 
-            # Save request/response → only matching responses reach this point!
-            if requests_log:
-                requests_log.write(f"==== REQUEST {request_counter} ====\n")
-                requests_log.write(f"{args.method} {fuzzed_url} HTTP/1.1\n")
-                for header, value in headers.items():
-                    requests_log.write(f"{header}: {value}\n")
-                requests_log.write("\n")
-                requests_log.write(fuzzed_body + "\n\n")
-
-            if responses_log:
-                responses_log.write(f"==== RESPONSE {request_counter} ====\n")
-                responses_log.write(f"HTTP/1.1 {response.status_code} {response.reason}\n")
-                for header, value in response.headers.items():
-                    responses_log.write(f"{header}: {value}\n")
-                responses_log.write("\n")
-                responses_log.write(response.text + "\n\n")
-
-            request_counter += 1
-
-            # Update status line after response
-            status_line = f"[*] Combo {current_combo_num}/{total_combos} | Status: {resp_status} | Length: {len(response.text)} | Param Values: {dict(zip(param_order, combo))}"
-            sys.stdout.write(f"\r{status_line.ljust(120)}")
-            sys.stdout.flush()
-
-            # If status matches filter-status-codes → print response permanently
-            if show_status_codes and resp_status in show_status_codes:
-                print()
-                print(f"[cyan][*] Response Status: {response.status_code}[/cyan]")
-                print(f"[cyan][*] Response Length: {len(response.text)}[/cyan]")
-                print(f"[dim]{response.text}[/dim]\n")
-
-            # Baseline diffing
-            status_changed, body_changed = is_interesting(
-                baseline_status, baseline_text,
-                response.status_code, response.text,
-                current_param=None
-            )
-
-            if status_changed or body_changed:
-                print()
-                print(f"[green][+] Interesting COMBO response | Param Values: {dict(zip(param_order, combo))}[/green]")
-                print(f"    Status: {response.status_code}, Length: {len(response.text)}\n")
-
-                if args.save:
-                    combo_name = "_".join(combo).replace("/", "_").replace("\\", "_").replace(" ", "_")
-                    filename = os.path.join(result_dir, f"combo_{combo_name}.txt")
-                    with open(filename, "w") as out:
-                        out.write(f"HTTP/1.1 {response.status_code} {response.reason}\n")
-                        for header, value in response.headers.items():
-                            out.write(f"{header}: {value}\n")
-                        out.write("\n")
-                        out.write(response.text)
-            findings.append({
-                            "url": prepared.url,
-                            "method": prepared.method,
-                            "param": " & ".join(param_order),
-                            "payload": str(combo),
-                            "status": response.status_code,
-                            "reason": response.reason,
-                            "length": len(response.text),
-                            "request_headers": "\n".join([f"{k}: {v}" for k, v in prepared.headers.items()]),
-                            "request_body": prepared.body.decode() if isinstance(prepared.body, bytes) else prepared.body,
-                            "response_headers": "\n".join([f"{k}: {v}" for k, v in response.headers.items()]),
-                            "response_body": response.text[:1000]
-                            })
-
-            current_combo_num += 1
-            time.sleep(args.delay)
 
-    else:
-        # === INDEPENDENT PARAM FUZZING ===
+def _part_name(label):
+    return label.replace(" ", "-").replace("/", "of")
 
 
-        total_requests = len(payloads) * len(param_list)
-        current_request_num = 1
-
-        for param in param_list:
-            placeholder = f"<<FUZZ_{param}>>"
-
-            for payload in payloads:
-                fuzzed_body = args.body.replace(placeholder, payload)
-                for other_param in param_list:
-                    if other_param != param:
-                        fuzzed_body = fuzzed_body.replace(f"<<FUZZ_{other_param}>>", "BASELINE_VALUE")
-
-                fuzzed_url = args.url.replace(f"<<FUZZ_{param}>>", payload)
-                for other_param in param_list:
-                    if other_param != param:
-                        fuzzed_url = fuzzed_url.replace(f"<<FUZZ_{other_param}>>", "BASELINE_VALUE")
-
-                pre_status_line = f"[*] Request {current_request_num}/{total_requests} | Param: {param} | Payload: '{payload}'"
-                sys.stdout.write(f"\r{pre_status_line.ljust(120)}")
-                sys.stdout.flush()
-
-                try:
-                    prepared,response = prepare_and_send_request(args.method, fuzzed_url, data=fuzzed_body, headers=headers, proxies=proxies)
-                    if include_regex:
-                          if not re.search(include_regex, response.text, re.IGNORECASE):
-                              current_request_num += 1
-                              continue
-                except Exception as e:
-                    sys.stdout.write(f"\r[red][-] Error sending request {current_request_num}/{total_requests} payload '{payload}': {e}[/red]\n")
-                    sys.stdout.flush()
-                    current_request_num += 1
-                    continue
-
-                resp_status = response.status_code
-
-                # Skip unwanted responses
-                if show_status_codes and resp_status not in show_status_codes:
-                    current_request_num += 1
-                    continue
-
-                if hide_status_codes and resp_status in hide_status_codes:
-                    current_request_num += 1
-                    continue
-
-                # Save request/response → only matching responses reach this point!
-                if requests_log:
-                    requests_log.write(f"==== REQUEST {request_counter} ====\n")
-                    requests_log.write(f"{args.method} {fuzzed_url} HTTP/1.1\n")
-                    for header, value in headers.items():
-                        requests_log.write(f"{header}: {value}\n")
-                    requests_log.write("\n")
-                    requests_log.write(fuzzed_body + "\n\n")
-
-                if responses_log:
-                    responses_log.write(f"==== RESPONSE {request_counter} ====\n")
-                    responses_log.write(f"HTTP/1.1 {response.status_code} {response.reason}\n")
-                    for header, value in response.headers.items():
-                        responses_log.write(f"{header}: {value}\n")
-                    responses_log.write("\n")
-                    responses_log.write(response.text + "\n\n")
-
-                request_counter += 1
-
-                status_line = f"[*] Request {current_request_num}/{total_requests} | Status: {resp_status} | Length: {len(response.text)} | Param: {param} | Payload: '{payload}'"
-                sys.stdout.write(f"\r{status_line.ljust(120)}")
-                sys.stdout.flush()
-
-                if show_status_codes and resp_status in show_status_codes:
-                    print()
-                    print(f"[cyan][*] Response Status: {response.status_code}[/cyan]")
-                    print(f"[cyan][*] Response Length: {len(response.text)}[/cyan]")
-                    print(f"[dim]{response.text}[/dim]\n")
-
-                status_changed, body_changed = is_interesting(
-                    baseline_status, baseline_text,
-                    response.status_code, response.text,
-                    current_param=param
-                )
-
-                if status_changed or body_changed:
-                    print()
-                    print(f"[green][+] Interesting response for param '{param}' payload '{payload}'[/green]")
-                    print(f"    Status: {response.status_code}, Length: {len(response.text)}\n")
-
-                    if args.save:
-                        safe_payload = payload.replace("/", "_").replace("\\", "_").replace(" ", "_")
-                        filename = os.path.join(result_dir, f"{param}_{safe_payload}.txt")
-                        with open(filename, "w") as out:
-                            out.write(f"HTTP/1.1 {response.status_code} {response.reason}\n")
-                            for header, value in response.headers.items():
-                                out.write(f"{header}: {value}\n")
-                            out.write("\n")
-                            out.write(response.text)
-
-                findings.append({
-                            "url": prepared.url,
-                            "method": prepared.method,
-                            "param": param,
-                            "payload": payload,
-                            "status": response.status_code,
-                            "reason": response.reason,
-                            "length": len(response.text),
-                            "request_headers": "\n".join([f"{k}: {v}" for k, v in prepared.headers.items()]),
-                            "request_body": prepared.body.decode() if isinstance(prepared.body, bytes) else prepared.body,
-                            "response_headers": "\n".join([f"{k}: {v}" for k, v in response.headers.items()]),
-                            "response_body": response.text[:1000]
-                            })
-
-                current_request_num += 1
-                time.sleep(args.delay)
-
-    if hasattr(args, "report") and args.report and findings:
-        generate_html_report(findings, os.path.join("results", args.report))
-
-
-    # Close logs
-    if requests_log:
-        requests_log.close()
-    if responses_log:
-        responses_log.close()
+def _merge_part_logs(result_dir, name, labels, ext="txt", mode="a"):
+    with open(os.path.join(result_dir, f"{name}.{ext}"), mode + "b") as merged:
+        for label in labels:
+            part = os.path.join(result_dir, f"{name}.{_part_name(label)}.{ext}")
+            if not os.path.exists(part):
+                continue
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, merged)
+            os.remove(part)
+
+
+def _merge_part_clusters(result_dir, labels, args):
+    # Worker clusters are folded into one index and the findings renumbered to match
+    clusters = ClusterIndex(args.cluster, getattr(args, "cluster_distance", 6))
+    with open(os.path.join(result_dir, "findings.jsonl"), "wb") as merged:
+        for label in labels:
+            part = _part_name(label)
+            clusters_part = os.path.join(result_dir, f"clusters.{part}.json")
+            ids = {c["id"]: clusters.merge(c).id for c in load_clusters(clusters_part)}
+            if os.path.exists(clusters_part):
+                os.remove(clusters_part)
+
+            findings_part = os.path.join(result_dir, f"findings.{part}.jsonl")
+            for record in read_findings(findings_part):
+                record["cluster"] = ids.get(record.get("cluster"))
+                merged.write(json.dumps(record).encode("utf-8") + b"\n")
+            if os.path.exists(findings_part):
+                os.remove(findings_part)
+    clusters.save(os.path.join(result_dir, "clusters.json"))
+
+
+def print_clusters(clusters, limit=20):
+    """Console table of the largest response clusters."""
+    table = Table(title=f"{len(clusters)} response clusters")
+    for column in ("Cluster", "Status", "Interesting", "Responses", "Kept", "Length", "First payload"):
+        table.add_column(column)
+    for cluster in sorted(clusters, key=lambda c: (-c["count"], c["id"]))[:limit]:
+        table.add_row(f"#{cluster['id']}", str(cluster["status"]), "yes" if cluster["interesting"] else "no",
+                      str(cluster["count"]), str(cluster["kept"]), str(cluster["length"]),
+                      escape(str(cluster["payload"])))
+    print(table)
+    if len(clusters) > limit:
+        print(f"[cyan][*] {len(clusters) - limit} smaller clusters not shown[/cyan]")
@@ -0,0 +1,77 @@
+import queue
+import tkinter as tk
+
+FRAME_MS = 50        # how often the Tk loop drains queued output (~20 fps)
+MAX_LINES = 5000     # console ring buffer size
+
+
+class QueueWriter:
+    """File-like stdout/stderr replacement for the fuzzing thread.
+
+    write() only puts the text on a queue; it never touches Tk, so the
+    fuzzer runs at full speed whatever the screen refresh rate.
+    """
+
+    def __init__(self, output_queue):
+        self.queue = output_queue
+
+    def write(self, text):
+        if text:
+            self.queue.put(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class Console:
+    """Text widget fed in batches from a QueueWriter, keeping the last max_lines lines.
+
+    drain() runs on the Tk main loop: it takes everything queued since the
+    last frame, collapses "\\r" status-line rewrites to their final state,
+    inserts the result once and trims the oldest lines.
+    """
+
+    def __init__(self, text_widget, max_lines=MAX_LINES):
+        self.text = text_widget
+        self.max_lines = max_lines
+        self.queue = queue.SimpleQueue()
+        self.writer = QueueWriter(self.queue)
+
+    def write(self, text):
+        """Queue text from any thread (shown on the next frame)."""
+        self.writer.write(text)
+
+    def clear(self):
+        self.text.delete("1.0", tk.END)
+
+    def drain(self):
+        chunks = []
+        try:
+            while True:
+                chunks.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if chunks:
+            self._render("".join(chunks))
+
+    def _render(self, text):
+        lines = text.split("\n")
+        if "\r" in lines[0]:
+            # Carriage return: rewrite the line the widget currently ends with
+            self.text.delete("end-1c linestart", "end-1c")
+        lines = [line.rsplit("\r", 1)[-1] for line in lines]
+        if len(lines) > self.max_lines:
+            # More than a screenful of history arrived at once: only the tail will survive
+            self.clear()
+            lines = lines[-self.max_lines:]
+        self.text.insert(tk.END, "\n".join(lines))
+
+        # Ring buffer: drop the oldest lines
+        excess = int(self.text.index("end-1c").split(".")[0]) - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+        self.text.see(tk.END)
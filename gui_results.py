@@ -0,0 +1,293 @@
+import tkinter as tk
+from array import array
+from tkinter import messagebox, ttk
+
+COLUMNS = ("num", "param", "payload", "status", "length", "latency")
+HEADINGS = {"num": "#", "param": "Param", "payload": "Payload", "status": "Status",
+            "length": "Length", "latency": "Latency (ms)"}
+WIDTHS = {"num": 70, "param": 120, "payload": 300, "status": 60, "length": 80, "latency": 90}
+
+BLOCK = 1000  # rows per block of the sorted index
+
+
+def _bisect_right(rows, k, key):
+    lo, hi = 0, len(rows)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if k < key(rows[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class ResultStore:
+    """Columnar store of the GUI's results, plus a sorted, filtered view of them.
+
+    Every column is a typed array (payloads are one utf-8 buffer plus
+    offsets), so a million rows take a few tens of MB. The view is a list
+    of row ids in blocks of ~BLOCK, kept sorted by (sort column, row id):
+    a streamed-in row is placed with two binary searches and one small
+    list insert. Changing the sort or the filter rebuilds the view.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.num = array("Q")
+        self.status = array("H")
+        self.length = array("Q")
+        self.latency = array("f")           # milliseconds
+        self.param = array("H")             # index into param_names
+        self.param_names = []
+        self._param_ids = {}
+        self._payload_data = bytearray()
+        self._payload_offsets = array("Q", [0])
+        self.sort_column = "num"
+        self.descending = False
+        self.filters = {}
+        self._value = self.num.__getitem__
+        self._blocks = []
+        self._shown = 0
+
+    def __len__(self):
+        return len(self.num)
+
+    @property
+    def shown(self):
+        """Rows passing the current filter."""
+        return self._shown
+
+    def append(self, num, param, payload, status, length, latency_ms):
+        param_id = self._param_ids.get(param)
+        if param_id is None:
+            param_id = self._param_ids[param] = len(self.param_names)
+            self.param_names.append(param)
+        row = len(self.num)
+        self.num.append(num)
+        self.status.append(status or 0)
+        self.length.append(length)
+        self.latency.append(latency_ms)
+        self.param.append(param_id)
+        self._payload_data += str(payload).encode("utf-8", errors="replace")
+        self._payload_offsets.append(len(self._payload_data))
+        if self._matches(row):
+            self._insert(row)
+        return row
+
+    def payload(self, row):
+        start, end = self._payload_offsets[row], self._payload_offsets[row + 1]
+        return self._payload_data[start:end].decode("utf-8", errors="replace")
+
+    def values(self, row):
+        return (self.num[row], self.param_names[self.param[row]], self.payload(row),
+                self.status[row], self.length[row], f"{self.latency[row]:.1f}")
+
+    # --- sorting and filtering ---
+
+    def _value_getter(self, column):
+        if column == "param":
+            names, ids = self.param_names, self.param
+            return lambda row: names[ids[row]]
+        if column == "payload":
+            return self.payload
+        return getattr(self, column).__getitem__
+
+    def _key(self, row):
+        return (self._value(row), row)
+
+    def set_sort(self, column, descending=False):
+        self.sort_column = column
+        self.descending = descending
+        self._rebuild()
+
+    def set_filter(self, status=None, param=None, length=(None, None), latency=(None, None)):
+        """Keep rows with status in status, this param, and length/latency within (min, max)."""
+        self.filters = {"status": set(status) if status else None, "param": param,
+                        "length": length, "latency": latency}
+        if not status and not param and length == (None, None) and latency == (None, None):
+            self.filters = {}
+        self._rebuild()
+
+    def _matches(self, row):
+        f = self.filters
+        if not f:
+            return True
+        if f["status"] and self.status[row] not in f["status"]:
+            return False
+        if f["param"] and self.param_names[self.param[row]] != f["param"]:
+            return False
+        for column in ("length", "latency"):
+            low, high = f[column]
+            value = getattr(self, column)[row]
+            if (low is not None and value < low) or (high is not None and value > high):
+                return False
+        return True
+
+    def _rebuild(self):
+        self._value = self._value_getter(self.sort_column)
+        rows = [row for row in range(len(self.num)) if self._matches(row)]
+        rows.sort(key=self._value)  # stable, so ties stay in row order like _key()
+        self._blocks = [rows[i:i + BLOCK] for i in range(0, len(rows), BLOCK)]
+        self._shown = len(rows)
+
+    def _insert(self, row):
+        if not self._blocks:
+            self._blocks.append([row])
+            self._shown = 1
+            return
+        k = self._key(row)
+        # First block whose last row sorts after the new one (or the last block)
+        lo, hi = 0, len(self._blocks) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if k < self._key(self._blocks[mid][-1]):
+                hi = mid
+            else:
+                lo = mid + 1
+        block = self._blocks[lo]
+        block.insert(_bisect_right(block, k, self._key), row)
+        if len(block) > 2 * BLOCK:
+            self._blocks[lo:lo + 1] = [block[:BLOCK], block[BLOCK:]]
+        self._shown += 1
+
+    def rows(self, start, count):
+        """Row ids at view positions start..start+count, in display order."""
+        if self.descending:
+            first = self._shown - start - 1
+            return list(reversed(self._ascending(max(first - count + 1, 0), first + 1)))
+        return self._ascending(start, min(start + count, self._shown))
+
+    def _ascending(self, start, end):
+        result = []
+        offset = 0
+        for block in self._blocks:
+            if offset + len(block) > start and start < end:
+                take = block[max(start - offset, 0):end - offset]
+                result.extend(take)
+                start += len(take)
+            offset += len(block)
+            if offset >= end:
+                break
+        return result
+
+
+class ResultsGrid(ttk.Frame):
+    """Treeview showing only the visible slice of a ResultStore.
+
+    The tree holds one item per visible line; scrolling, resizing or new
+    results just rewrite those items' values from the store. Click a
+    heading to sort by it (again to reverse).
+    """
+
+    def __init__(self, parent, store):
+        super().__init__(parent)
+        self.store = store
+        self.top = 0
+        self._items = []
+
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Status:").pack(side=tk.LEFT)
+        self.status_entry = ttk.Entry(filter_frame, width=12)
+        self.status_entry.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(filter_frame, text="Param:").pack(side=tk.LEFT)
+        self.param_combo = ttk.Combobox(filter_frame, width=14, postcommand=self._refresh_params)
+        self.param_combo.pack(side=tk.LEFT, padx=(2, 8))
+        self.range_entries = {}
+        for column, label in (("length", "Length:"), ("latency", "Latency ms:")):
+            ttk.Label(filter_frame, text=label).pack(side=tk.LEFT)
+            low = ttk.Entry(filter_frame, width=7)
+            low.pack(side=tk.LEFT, padx=(2, 0))
+            ttk.Label(filter_frame, text="-").pack(side=tk.LEFT)
+            high = ttk.Entry(filter_frame, width=7)
+            high.pack(side=tk.LEFT, padx=(0, 8))
+            self.range_entries[column] = (low, high)
+        ttk.Button(filter_frame, text="Apply", command=self.apply_filter).pack(side=tk.LEFT)
+        ttk.Button(filter_frame, text="Clear", command=self.clear_filter).pack(side=tk.LEFT, padx=5)
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=COLUMNS, show="headings", selectmode="browse")
+        for column in COLUMNS:
+            self.tree.heading(column, text=HEADINGS[column], command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=WIDTHS[column], stretch=column == "payload",
+                             anchor=tk.W if column in ("param", "payload") else tk.E)
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", lambda event: self.refresh())
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(1, "units"))
+
+    def _visible_rows(self):
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        return max(1, (self.tree.winfo_height() - 25) // row_height)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * self.store.shown)
+            self.refresh()
+        else:
+            self.scroll(int(amount), unit)
+
+    def scroll(self, amount, unit="units"):
+        step = self._visible_rows() if unit == "pages" else 3
+        self.top += amount * step
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the visible slice; cheap enough to call once per frame."""
+        visible = self._visible_rows()
+        shown = self.store.shown
+        self.top = max(0, min(self.top, shown - visible))
+        while len(self._items) < visible:
+            self._items.append(self.tree.insert("", tk.END, values=()))
+        while len(self._items) > visible:
+            self.tree.delete(self._items.pop())
+        rows = self.store.rows(self.top, visible)
+        for i, item in enumerate(self._items):
+            self.tree.item(item, values=self.store.values(rows[i]) if i < len(rows) else ())
+        if shown:
+            self.scrollbar.set(self.top / shown, min(1.0, (self.top + visible) / shown))
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{shown:,} of {len(self.store):,} rows")
+
+    def sort_by(self, column):
+        descending = column == self.store.sort_column and not self.store.descending
+        self.store.set_sort(column, descending)
+        for c in COLUMNS:
+            arrow = (" ▼" if descending else " ▲") if c == column else ""
+            self.tree.heading(c, text=HEADINGS[c] + arrow)
+        self.top = 0
+        self.refresh()
+
+    def _refresh_params(self):
+        self.param_combo["values"] = [""] + self.store.param_names
+
+    def apply_filter(self):
+        try:
+            status = [int(x.strip()) for x in self.status_entry.get().split(",") if x.strip()]
+            ranges = {}
+            for column, (low, high) in self.range_entries.items():
+                ranges[column] = tuple(float(e.get()) if e.get().strip() else None for e in (low, high))
+        except ValueError:
+            messagebox.showerror("Error", "Status must be comma-separated codes, lengths/latencies numbers")
+            return
+        self.store.set_filter(status=status, param=self.param_combo.get().strip() or None,
+                              length=ranges["length"], latency=ranges["latency"])
+        self.top = 0
+        self.refresh()
+
+    def clear_filter(self):
+        for entry in [self.status_entry, self.param_combo] + [e for pair in self.range_entries.values() for e in pair]:
+            entry.delete(0, tk.END)
+        self.store.set_filter()
+        self.top = 0
+        self.refresh()
@@ -0,0 +1,263 @@
+import json
+import re
+
+# Exclusion paths look like DeepDiff's, plus wildcards:
+#   root['user']['email']   root.user.email   root.items[*].updatedAt   root.**.id
+# [*] / .* match any one key or index, .** matches any number of levels.
+PATH_TOKEN_RE = re.compile(r"""\.(\*\*|\*|[^.\[\]]+)|\[(\*|\d+|'[^']*'|"[^"]*")\]""")
+
+
+class _Marker:
+    """Path trie marker, compared by identity.
+
+    Pickles as a reference to the module global, so tries sent to
+    --workers processes still match.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+    def __reduce__(self):
+        return self.name
+
+
+ANY = _Marker("ANY")
+ANY_DEPTH = _Marker("ANY_DEPTH")
+END = _Marker("END")
+
+
+def parse_path(path):
+    """Split an exclusion path into tokens: str keys, int indexes, ANY, ANY_DEPTH."""
+    path = path.strip()
+    if path.startswith("root"):
+        path = path[4:]
+
+    tokens = []
+    pos = 0
+    for match in PATH_TOKEN_RE.finditer(path):
+        if match.start() != pos:
+            break
+        pos = match.end()
+        name, bracket = match.groups()
+        if name == "**":
+            tokens.append(ANY_DEPTH)
+        elif name == "*" or bracket == "*":
+            tokens.append(ANY)
+        elif name is not None:
+            tokens.append(name)
+        elif bracket[0] in "'\"":
+            tokens.append(bracket[1:-1])
+        else:
+            tokens.append(int(bracket))
+    if pos != len(path):
+        raise ValueError(f"Invalid JSON path: {path!r}")
+    return tokens
+
+
+def compile_paths(paths):
+    """Compile exclusion paths into a trie; pass the result as exclude=."""
+    root = {}
+    for path in paths:
+        node = root
+        for token in parse_path(path):
+            if token is ANY_DEPTH:
+                if ANY_DEPTH not in node:
+                    deep = {}
+                    loop = {}
+                    loop[ANY_DEPTH] = (deep, loop)  # ** keeps consuming levels
+                    node[ANY_DEPTH] = (deep, loop)
+                node = node[ANY_DEPTH][0]
+            else:
+                node = node.setdefault(token, {})
+        node[END] = True
+    return (root,) if root else ()
+
+
+def _children(node, key):
+    # key None: a list element when order is ignored, only wildcards apply
+    if key is not None and key in node:
+        yield node[key]
+    if ANY in node:
+        yield node[ANY]
+    if ANY_DEPTH in node:
+        deep, loop = node[ANY_DEPTH]
+        if END in deep:
+            yield deep
+        yield from _children(deep, key)
+        yield loop
+
+
+def _step(nodes, key):
+    """Exclusion state one level down: (nodes, excluded)."""
+    if not nodes:
+        return nodes, False
+    out = []
+    for node in nodes:
+        for child in _children(node, key):
+            if END in child:
+                return (), True
+            out.append(child)
+    return tuple(out), False
+
+
+def _has_index(nodes):
+    # [N] exclusions name positions, so arrays at this level must be compared in order
+    for node in nodes:
+        if any(isinstance(key, int) for key in node):
+            return True
+        if ANY_DEPTH in node and _has_index((node[ANY_DEPTH][0],)):
+            return True
+    return False
+
+
+def _excluded_root(exclude):
+    return any(END in node for node in exclude)
+
+
+def json_equal(a, b, exclude=(), ignore_order=True):
+    """True if a and b match outside the excluded paths; stops at the first difference.
+
+    Values must have the same type (1, 1.0 and True all differ). With
+    ignore_order, arrays are compared as multisets of element fingerprints,
+    except where an exclusion names an index (root.tags[0]): those arrays
+    are compared in order.
+    """
+    if exclude and _excluded_root(exclude):
+        return True
+    return _equal(a, b, exclude or (), ignore_order)
+
+
+def _equal(a, b, nodes, ignore_order):
+    kind = type(a)
+    if kind is not type(b):
+        return False
+
+    if kind is dict:
+        if not nodes:
+            if a.keys() != b.keys():
+                return False
+            for key, value in a.items():
+                if not _equal(value, b[key], (), ignore_order):
+                    return False
+            return True
+
+        for key in a.keys() | b.keys():
+            child, excluded = _step(nodes, key)
+            if excluded:
+                continue
+            if key not in a or key not in b:
+                return False
+            if not _equal(a[key], b[key], child, ignore_order):
+                return False
+        return True
+
+    if kind is list:
+        if len(a) != len(b):
+            return False
+
+        if not ignore_order or _has_index(nodes):
+            for index, (x, y) in enumerate(zip(a, b)):
+                child, excluded = _step(nodes, index)
+                if not excluded and not _equal(x, y, child, ignore_order):
+                    return False
+            return True
+
+        child, excluded = _step(nodes, None)
+        if excluded:
+            return True
+        # Same order is by far the common case: match positionally, then
+        # compare only the rest as multisets of fingerprints
+        for index, (x, y) in enumerate(zip(a, b)):
+            if not _equal(x, y, child, ignore_order):
+                break
+        else:
+            return True
+        rest_a = sorted(_fingerprint(x, child) for x in a[index:])
+        rest_b = sorted(_fingerprint(y, child) for y in b[index:])
+        return rest_a == rest_b
+
+    return a == b
+
+
+def _fingerprint(value, nodes):
+    # Canonical text of a value with excluded paths dropped and arrays sorted
+    kind = type(value)
+    if kind is dict:
+        parts = []
+        for key in sorted(value):
+            child, excluded = _step(nodes, key)
+            if not excluded:
+                parts.append(f"{json.dumps(key)}:{_fingerprint(value[key], child)}")
+        return "{" + ",".join(parts) + "}"
+    if kind is list:
+        if _has_index(nodes):
+            parts = []
+            for index, item in enumerate(value):
+                child, excluded = _step(nodes, index)
+                parts.append("-" if excluded else _fingerprint(item, child))
+            return "(" + ",".join(parts) + ")"
+        child, excluded = _step(nodes, None)
+        if excluded:
+            return "[]"
+        return "[" + ",".join(sorted(_fingerprint(item, child) for item in value)) + "]"
+    return f"{kind.__name__}:{json.dumps(value)}"
+
+
+def format_path(tokens):
+    path = "root"
+    for token in tokens:
+        if isinstance(token, int):
+            path += f"[{token}]"
+        elif token.isidentifier():
+            path += f".{token}"
+        else:
+            path += f"[{json.dumps(token)}]"
+    return path
+
+
+def json_diff(a, b, exclude=(), ignore_order=True, limit=None):
+    """Paths where a and b differ outside the excluded paths (at most limit of them)."""
+    if exclude and _excluded_root(exclude):
+        return []
+    diffs = []
+    _collect(a, b, exclude or (), ignore_order, [], diffs, limit)
+    return diffs
+
+
+def _collect(a, b, nodes, ignore_order, path, diffs, limit):
+    if limit is not None and len(diffs) >= limit:
+        return
+    kind = type(a)
+    if kind is not type(b):
+        diffs.append(format_path(path))
+        return
+
+    if kind is dict:
+        for key in sorted(a.keys() | b.keys(), key=str):
+            child, excluded = _step(nodes, key)
+            if excluded:
+                continue
+            if key not in a or key not in b:
+                diffs.append(format_path(path + [key]))
+            else:
+                _collect(a[key], b[key], child, ignore_order, path + [key], diffs, limit)
+            if limit is not None and len(diffs) >= limit:
+                return
+        return
+
+    if kind is list:
+        if (not ignore_order or _has_index(nodes)) and len(a) == len(b):
+            for index, (x, y) in enumerate(zip(a, b)):
+                child, excluded = _step(nodes, index)
+                if not excluded:
+                    _collect(x, y, child, ignore_order, path + [index], diffs, limit)
+        elif not _equal(a, b, nodes, ignore_order):
+            # Unordered arrays cannot be matched up element by element
+            diffs.append(format_path(path))
+        return
+
+    if a != b:
+        diffs.append(format_path(path))
@@ -0,0 +1,260 @@
+import glob
+import gzip
+import io
+import os
+import queue
+import re
+import threading
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for --log-compress zstd
+    zstandard = None
+
+COMPRESS_EXT = {None: "", "gzip": ".gz", "zstd": ".zst"}
+BATCH_BYTES = 1 << 20
+
+
+def format_request(record_id, method, url, headers, body):
+    lines = [f"==== REQUEST {record_id} ====", f"{method} {url} HTTP/1.1"]
+    lines.extend(f"{header}: {value}" for header, value in headers)
+    lines.append("")
+    lines.append(body.decode("utf-8", errors="replace") if isinstance(body, bytes) else (body or ""))
+    return "\n".join(lines) + "\n\n"
+
+
+def format_response(record_id, status, reason, headers, text, truncated_at=None):
+    lines = [f"==== RESPONSE {record_id} ====", f"HTTP/1.1 {status} {reason}"]
+    lines.extend(f"{header}: {value}" for header, value in headers)
+    lines.append("")
+    lines.append(text)
+    if truncated_at is not None:
+        lines.append(f"[body truncated at {truncated_at} bytes]")
+    return "\n".join(lines) + "\n\n"
+
+
+def segment_path(path, index, compress=None):
+    """File of segment index of a log (0: not rotated, path itself)."""
+    if not index:
+        return path + COMPRESS_EXT[compress]
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{index:04d}{ext}{COMPRESS_EXT[compress]}"
+
+
+def _numbered_segments(path):
+    stem, ext = os.path.splitext(path)
+    pattern = re.compile(re.escape(os.path.basename(stem)) + r"\.(\d{4,})" + re.escape(ext) + r"(\.gz|\.zst)?$")
+    numbered = []
+    for candidate in glob.glob(glob.escape(stem) + ".*"):
+        match = pattern.match(os.path.basename(candidate))
+        if match:
+            numbered.append((int(match.group(1)), candidate))
+    return sorted(numbered)
+
+
+def log_segments(path):
+    """Existing files of a log in write order: path[.gz|.zst], then path's numbered segments."""
+    files = [path + c for c in COMPRESS_EXT.values() if os.path.exists(path + c)]
+    return files + [name for _, name in _numbered_segments(path)]
+
+
+def _open_reader(name):
+    if name.endswith(".gz"):
+        return gzip.open(name, "rb")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{name} is zstd-compressed: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(name, "rb"), read_across_frames=True, closefd=True)
+    return open(name, "rb")
+
+
+def read_log(path):
+    """Stream the lines of a request/response log back across all its segments."""
+    for name in log_segments(path):
+        with _open_reader(name) as raw:
+            for line in io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline=""):
+                yield line
+
+
+def read_log_records(path):
+    """Group read_log() lines into records, each starting at a "==== ... ====" line."""
+    record = []
+    for line in read_log(path):
+        if line.startswith("==== ") and record:
+            yield "".join(record)
+            record = []
+        record.append(line)
+    if record:
+        yield "".join(record)
+
+
+def merge_logs(path, part_paths, compress=None, rotate=False):
+    """Move worker part logs onto the end of path, in order.
+
+    Compressed streams concatenate (gzip members, zstd frames), so
+    single-file logs are appended byte for byte; rotated logs just have
+    their segments renumbered after path's last one.
+    """
+    if not rotate:
+        target = segment_path(path, 0, compress)
+        with open(target, "ab") as merged:
+            for part in part_paths:
+                name = segment_path(part, 0, compress)
+                if not os.path.exists(name):
+                    continue
+                with open(name, "rb") as f:
+                    while True:
+                        chunk = f.read(1 << 20)
+                        if not chunk:
+                            break
+                        merged.write(chunk)
+                os.remove(name)
+        return
+
+    numbered = _numbered_segments(path)
+    index = numbered[-1][0] if numbered else 0
+    for part in part_paths:
+        for _, name in _numbered_segments(part):
+            index += 1
+            os.replace(name, segment_path(path, index, compress))
+
+
+class LogWriter:
+    """Request/response log written by a background thread.
+
+    write() only queues a formatter and its arguments; the writer thread
+    formats records, joins them into ~1 MiB batches and writes them,
+    optionally through gzip/zstd and into numbered segments of about
+    segment_bytes each. The queue is bounded, so a stalled disk slows the
+    campaign down instead of filling memory.
+
+    flush() ends the current gzip member / zstd frame, so tell() is always
+    a clean place for truncate() to cut the log back to on resume.
+    Only one thread may call write()/flush()/tell()/truncate().
+    """
+
+    def __init__(self, path, compress=None, segment_bytes=None, queue_size=4096):
+        if compress == "zstd" and zstandard is None:
+            raise RuntimeError("--log-compress zstd needs the zstandard package (pip install zstandard)")
+        self.path = path
+        self.compress = compress
+        self.segment_bytes = segment_bytes
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+
+        # Appends to what is already there, like the plain log always did
+        self._index = 0
+        if segment_bytes:
+            numbered = _numbered_segments(path)
+            self._index = numbered[-1][0] if numbered else 1
+        self._raw = None
+        self._stream = None
+        self._open()
+
+        self._thread = threading.Thread(target=self._run, name=f"log-writer {os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        self._raw = open(segment_path(self.path, self._index, self.compress), "ab")
+        self._stream = None
+
+    def _ensure_stream(self):
+        # A member/frame is only started once there is something to put in it
+        if self._stream is None:
+            if self.compress == "gzip":
+                self._stream = gzip.GzipFile(fileobj=self._raw, mode="ab", compresslevel=6)
+            elif self.compress == "zstd":
+                self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+            else:
+                self._stream = self._raw
+        return self._stream
+
+    def _end_stream(self):
+        if self._stream is not None and self._stream is not self._raw:
+            self._stream.close()
+        self._stream = None
+        self._raw.flush()
+
+    def _write_batch(self, batch):
+        self._ensure_stream().write("".join(batch).encode("utf-8", errors="replace"))
+        if self.segment_bytes and self._raw.tell() >= self.segment_bytes:
+            self._end_stream()
+            self._raw.close()
+            self._index += 1
+            self._open()
+
+    def _next_batch(self):
+        # Block for one item, then take whatever else is already queued, up to one batch
+        batch = []
+        size = 0
+        item = self._queue.get()
+        while True:
+            if item[0] != "record":
+                return batch, item
+            try:
+                text = item[1](*item[2])
+                batch.append(text)
+                size += len(text)
+            except Exception as e:
+                self._error = e
+            if size >= BATCH_BYTES:
+                return batch, None
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, None
+
+    def _run(self):
+        while True:
+            batch, control = self._next_batch()
+            try:
+                if batch:
+                    self._write_batch(batch)
+                if control is not None:
+                    self._end_stream()
+                    if control[0] == "close":
+                        self._raw.close()
+            except Exception as e:
+                self._error = e
+            if control is not None:
+                control[1].set()
+                if control[0] == "close":
+                    return
+
+    def _control(self, kind):
+        done = threading.Event()
+        self._queue.put((kind, done))
+        done.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def write(self, formatter, *args):
+        """Queue one record; formatter(*args) runs on the writer thread."""
+        self._queue.put(("record", formatter, args))
+
+    def flush(self):
+        """Wait until everything queued is on disk."""
+        self._control("flush")
+
+    def tell(self):
+        """Position after the last flush(): [segment, byte offset]."""
+        return [self._index, self._raw.tell()]
+
+    def truncate(self, position):
+        """Cut the log back to a tell() position (or a plain byte offset)."""
+        self.flush()
+        index, offset = position if isinstance(position, list) else (self._index, position)
+        self._raw.close()
+        for number, name in _numbered_segments(self.path):
+            if number > index:
+                os.remove(name)
+        self._index = index
+        with open(segment_path(self.path, index, self.compress), "ab") as f:
+            f.truncate(offset)
+        self._open()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._control("close")
+            self._thread.join()
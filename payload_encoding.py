@@ -0,0 +1,63 @@
+import json
+from functools import lru_cache
+from urllib.parse import quote
+
+# Where a placeholder sits decides how a payload must be escaped to land
+# in the parameter intact instead of breaking the surrounding syntax.
+JSON_STRING = "json_string"   # inside a JSON string literal: "<<FUZZ_x>>"
+JSON_VALUE = "json_value"     # bare JSON value: {"n": <<FUZZ_x>>}
+QUERY = "query"               # URL query string / form-encoded body
+PATH = "path"                 # URL path segment
+HEADER = "header"             # header value
+RAW = "raw"                   # sent verbatim
+
+
+def _encode_json_value(payload):
+    # Valid JSON (numbers, booleans, null, objects...) goes in as-is so
+    # type-confusion payloads still work; anything else becomes a string.
+    try:
+        json.loads(payload)
+        return payload
+    except ValueError:
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _encode_header(payload):
+    # CR/LF would split the header, non latin-1 text is rejected by http.client
+    payload = payload.replace("\r", "%0D").replace("\n", "%0A")
+    try:
+        payload.encode("latin-1")
+        return payload
+    except UnicodeEncodeError:
+        return quote(payload, safe=" !\"#$&'()*+,-./:;<=>?@[\\]^_`{|}~")
+
+
+ENCODERS = {
+    JSON_STRING: lambda payload: json.dumps(payload, ensure_ascii=False)[1:-1],
+    JSON_VALUE: _encode_json_value,
+    QUERY: lambda payload: quote(payload, safe=""),
+    PATH: lambda payload: quote(payload, safe=""),
+    HEADER: _encode_header,
+    RAW: lambda payload: payload,
+}
+
+
+class PayloadEncoder:
+    """Encodes payloads per slot context, once per (context, payload) for the run."""
+
+    def __init__(self, enabled=True, cache_size=1 << 16):
+        self.enabled = enabled
+        self._text = {}
+        self._bytes = {}
+        for context, encode in ENCODERS.items():
+            if not enabled:
+                encode = ENCODERS[RAW]
+            text = lru_cache(maxsize=cache_size)(encode)
+            self._text[context] = text
+            self._bytes[context] = lru_cache(maxsize=cache_size)(lambda payload, text=text: text(payload).encode("utf-8"))
+
+    def text(self, context, payload):
+        return self._text[context](payload)
+
+    def bytes(self, context, payload):
+        return self._bytes[context](payload)
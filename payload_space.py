@@ -0,0 +1,82 @@
+class ComboSpace:
+    """Lazy cartesian product of per-param payload lists (Cluster Bomb order).
+
+    Combinations are never materialised: a global index maps to a combo and
+    back as a mixed-radix number whose last digit varies fastest, i.e. the
+    same order itertools.product() yields them in.
+    """
+
+    def __init__(self, value_lists):
+        self.value_lists = list(value_lists)
+        self.radices = [len(values) for values in self.value_lists]
+
+        self.size = 1
+        for radix in self.radices:
+            self.size *= radix
+
+        # value -> first index, built on first index_of() call per list
+        self._positions = {}
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.iter_range(0, self.size)
+
+    def __getitem__(self, index):
+        return tuple(values[digit] for values, digit in zip(self.value_lists, self.digits(index)))
+
+    def digits(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("combo index out of range")
+
+        digits = [0] * len(self.radices)
+        for pos in range(len(self.radices) - 1, -1, -1):
+            index, digits[pos] = divmod(index, self.radices[pos])
+        return digits
+
+    def index_of(self, combo):
+        """Global index of a combo; duplicate payloads resolve to their first occurrence."""
+        if len(combo) != len(self.radices):
+            raise ValueError("combo length does not match the number of params")
+
+        index = 0
+        for pos, value in enumerate(combo):
+            values = self.value_lists[pos]
+            key = id(values)
+            if key not in self._positions:
+                positions = {}
+                for i, v in enumerate(values):
+                    positions.setdefault(v, i)
+                self._positions[key] = positions
+            try:
+                digit = self._positions[key][value]
+            except KeyError:
+                raise ValueError(f"{value!r} is not a payload of param #{pos + 1}")
+            index = index * self.radices[pos] + digit
+        return index
+
+    def iter_range(self, start, stop):
+        """Yield combos for global indexes in [start, stop), O(1) per step."""
+        stop = min(stop, self.size)
+        if start >= stop:
+            return
+
+        digits = self.digits(start)
+        current = [values[digit] for values, digit in zip(self.value_lists, digits)]
+
+        for _ in range(stop - start):
+            yield tuple(current)
+
+            # Odometer increment, carrying into the slower-moving params
+            pos = len(digits) - 1
+            while pos >= 0:
+                digits[pos] += 1
+                if digits[pos] < self.radices[pos]:
+                    current[pos] = self.value_lists[pos][digits[pos]]
+                    break
+                digits[pos] = 0
+                current[pos] = self.value_lists[pos][0]
+                pos -= 1
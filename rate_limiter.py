@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+BACKOFF_STATUSES = {429, 503}
+# Statuses that mean the server (or a gateway in front of it) is overloaded
+OVERLOAD_STATUSES = {502, 503, 504}
+# Weight of each healthy window in the healthy p95 average
+HEALTHY_P95_WEIGHT = 0.2
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket shared by every engine worker, with optional AIMD tuning.
+
+    acquire() reserves a token and sleeps until it is due, so concurrent
+    callers are spaced out at `rate` requests/second overall. With
+    adaptive=True the rate grows additively while error rate and p95
+    latency stay healthy, and is cut multiplicatively on 429/503 (pausing
+    for their Retry-After, if any), on transport errors and 502/504, or on
+    p95 latency drifting above its healthy level. Replies to requests sent
+    before the last cut describe the old rate and are ignored, so a burst
+    of in-flight 429s cuts it once. That level follows the
+    p95 of healthy windows (an exponential average), so it can rise again
+    after a lucky fast window or a lasting change of the target.
+    rate=None means unlimited (unless adaptive, which needs a start rate).
+    """
+
+    def __init__(self, rate=None, burst=1, adaptive=False, min_rate=0.1, max_rate=None,
+                 window=50, latency_factor=2.0, error_threshold=0.1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.adaptive = adaptive and bool(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.window = window
+        self.latency_factor = latency_factor
+        self.error_threshold = error_threshold
+        self.increase_step = max(0.5, (rate or 0) * 0.1)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+        self._starts = deque(maxlen=200)          # request start times, for the measured rate
+        self._latencies = deque(maxlen=window)
+        self._errors = deque(maxlen=window)
+        self._healthy_p95 = None
+        self._last_decrease = float("-inf")
+        self._since_adjust = 0
+
+    @classmethod
+    def from_args(cls, args):
+        rate = getattr(args, "rate", None)
+        if not rate:
+            # --delay N used to pace each thread/slot to one request every N seconds
+            delay = getattr(args, "delay", 0) or 0
+            if getattr(args, "engine", "sync") == "async":
+                slots = getattr(args, "concurrency", 10) or 10
+            else:
+                slots = getattr(args, "threads", 1) or 1
+            rate = slots / delay if delay > 0 else None
+        return cls(
+            rate=rate,
+            burst=getattr(args, "burst", 1) or 1,
+            adaptive=getattr(args, "adaptive", False),
+            max_rate=getattr(args, "max_rate", None),
+        )
+
+    def _reserve(self):
+        """Take a token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._starts.append(now)
+            if not self.rate:
+                return 0.0
+
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, status, latency, retry_after=None):
+        """Feed back one outcome; status None means the request failed outright."""
+        if not self.adaptive:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            # latency runs from the request's start
+            stale = now - latency < self._last_decrease
+            if status in BACKOFF_STATUSES:
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    self._paused_until = max(self._paused_until, now + delay)
+                if not stale:
+                    self._decrease(0.5)
+                return
+            if stale:
+                return
+
+            self._latencies.append(latency)
+            # Other 5xx are the application failing on a payload, not overload
+            self._errors.append(status is None or status in OVERLOAD_STATUSES)
+            self._since_adjust += 1
+            if self._since_adjust < self.window:
+                return
+            self._since_adjust = 0
+
+            p95 = sorted(self._latencies)[int(len(self._latencies) * 0.95) - 1]
+            error_rate = sum(self._errors) / len(self._errors)
+
+            if self._healthy_p95 is None:
+                self._healthy_p95 = p95
+
+            if error_rate > self.error_threshold or p95 > self._healthy_p95 * self.latency_factor:
+                self._decrease(0.7)
+            else:
+                self._healthy_p95 += HEALTHY_P95_WEIGHT * (p95 - self._healthy_p95)
+                self.rate += self.increase_step
+                if self.max_rate:
+                    self.rate = min(self.rate, self.max_rate)
+
+    def _decrease(self, factor):
+        self.rate = max(self.min_rate, self.rate * factor)
+        self._tokens = min(self._tokens, 0.0)
+        self._latencies.clear()
+        self._errors.clear()
+        self._since_adjust = 0
+        self._last_decrease = time.monotonic()
+
+    def current_rate(self):
+        """Requests/second actually being started, over the recent window."""
+        with self._lock:
+            if len(self._starts) < 2:
+                return 0.0
+            span = self._starts[-1] - self._starts[0]
+            return (len(self._starts) - 1) / span if span > 0 else 0.0
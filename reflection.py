@@ -0,0 +1,86 @@
+import html
+import json
+import re
+from functools import lru_cache
+from urllib.parse import quote, quote_plus
+
+RAW = "raw"
+URL = "url"
+HTML = "html"
+JSON = "json"
+
+FORMS = (RAW, URL, HTML, JSON)
+
+# Shorter payloads ("1", "a") would be "reflected" by almost any body
+MIN_LENGTH = 3
+
+_PERCENT_RE = re.compile(r"%[0-9A-F]{2}")
+
+
+def _url_forms(payload):
+    for encoded in (quote(payload, safe=""), quote_plus(payload, safe="")):
+        yield encoded
+        yield _PERCENT_RE.sub(lambda m: m.group(0).lower(), encoded)
+
+
+def _html_forms(payload):
+    escaped = html.escape(payload)
+    yield escaped
+    yield escaped.replace("&#x27;", "&#39;")
+    yield html.escape(payload, quote=False)
+
+
+def _json_forms(payload):
+    for ensure_ascii in (False, True):
+        escaped = json.dumps(payload, ensure_ascii=ensure_ascii)[1:-1]
+        yield escaped
+        yield escaped.replace("/", "\\/")
+
+
+ENCODERS = {
+    RAW: lambda payload: [payload],
+    URL: _url_forms,
+    HTML: _html_forms,
+    JSON: _json_forms,
+}
+
+
+@lru_cache(maxsize=1 << 16)
+def reflection_forms(payload):
+    """((form, needle bytes), ...) to look for; each distinct needle once, under its first form."""
+    if len(payload) < MIN_LENGTH:
+        return ()
+    seen = set()
+    needles = []
+    for form in FORMS:
+        for text in ENCODERS[form](payload):
+            needle = text.encode("utf-8", errors="replace")
+            if needle not in seen:
+                seen.add(needle)
+                needles.append((form, needle))
+    return tuple(needles)
+
+
+def parse_forms(spec):
+    """Forms from a comma-separated --reflected value."""
+    forms = [form.strip().lower() for form in spec.split(",") if form.strip()]
+    unknown = [form for form in forms if form not in FORMS]
+    if unknown:
+        raise ValueError(f"Unknown reflection form(s) {', '.join(unknown)}, expected some of {', '.join(FORMS)}")
+    return set(forms)
+
+
+def find_reflections(body, payloads):
+    """Forms in which any of payloads comes back in body (bytes), in FORMS order.
+
+    Needles are precomputed once per payload; each check is a plain
+    bytes substring search.
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8", errors="replace")
+    found = set()
+    for payload in payloads:
+        for form, needle in reflection_forms(payload):
+            if form not in found and needle in body:
+                found.add(form)
+    return [form for form in FORMS if form in found]
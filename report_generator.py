@@ -1,91 +1,274 @@
+import json
 import os
+from collections import Counter
 from datetime import datetime
+from itertools import islice
 
-def generate_html_report(findings, output_path):
-    html = f"""
-    <html>
-    <head>
-        <title>API Fuzzing Report</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                background-color: #f8f8f8;
-                padding: 20px;
-            }}
-            h1 {{
-                color: #333;
-            }}
-            .finding {{
-                background-color: #fff;
-                padding: 15px;
-                margin-bottom: 20px;
-                border-left: 5px solid #007acc;
-                box-shadow: 0 0 10px rgba(0,0,0,0.1);
-            }}
-            .req-resp {{
-                display: flex;
-                gap: 20px;
-                margin-top: 10px;
-            }}
-            .column {{
-                flex: 1;
-                background-color: #f0f0f0;
-                padding: 10px;
-                border-radius: 5px;
-                font-family: monospace;
-                font-size: 13px;
-                overflow-x: auto;
-                max-height: 500px;
-                white-space: pre-wrap;
-                word-wrap: break-word;
-            }}
-            code {{
-                background-color: #eee;
-                padding: 2px 4px;
-                border-radius: 3px;
-            }}
-        </style>
-    </head>
-    <body>
-        <h1>API Fuzzing Report</h1>
-        <p>Generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-    """
+from jinja2 import DictLoader, Environment
+
+STYLE = """
+    body {
+        font-family: Arial, sans-serif;
+        background-color: #f8f8f8;
+        padding: 20px;
+    }
+    h1 {
+        color: #333;
+    }
+    .nav {
+        margin: 10px 0 20px;
+    }
+    .nav a {
+        margin-right: 15px;
+    }
+    .finding {
+        background-color: #fff;
+        padding: 15px;
+        margin-bottom: 20px;
+        border-left: 5px solid #007acc;
+        box-shadow: 0 0 10px rgba(0,0,0,0.1);
+    }
+    .req-resp {
+        display: flex;
+        gap: 20px;
+        margin-top: 10px;
+    }
+    .column {
+        flex: 1;
+        background-color: #f0f0f0;
+        padding: 10px;
+        border-radius: 5px;
+        font-family: monospace;
+        font-size: 13px;
+        overflow-x: auto;
+        max-height: 500px;
+        white-space: pre-wrap;
+        word-wrap: break-word;
+    }
+    code {
+        background-color: #eee;
+        padding: 2px 4px;
+        border-radius: 3px;
+    }
+    table {
+        border-collapse: collapse;
+        background-color: #fff;
+    }
+    th, td {
+        border: 1px solid #ddd;
+        padding: 6px 12px;
+        text-align: left;
+    }
+"""
 
-    for i, item in enumerate(findings, 1):
-        html += f"""
-        <div class='finding'>
-            <h2>Packet {i}</h2>
-            <p><strong>URL:</strong> {item['url']}</p>
-            <p><strong>Method:</strong> {item['method']}</p>
-            <p><strong>Param:</strong> {item['param']}</p>
-            <p><strong>Payload:</strong> <code>{item['payload']}</code></p>
-            <p><strong>Status:</strong> {item['status']} {item['reason']}</p>
-            <p><strong>Length:</strong> {item['length']}</p>
-            <div class="req-resp">
-                <div class="column">
-                    <h3>Request</h3>
-                    <pre>{item.get('method', '')} {item.get('url', '')}</pre>
-                    <p><strong>Headers:</strong></p>
-                    <pre>{item.get('request_headers', '')}</pre>
-                    <p><strong>Body:</strong></p>
-                    <pre>{item.get('request_body', '')}</pre>
-                </div>
-                <div class="column">
-                    <h3>Response</h3>
-                    <p><strong>Headers:</strong></p>
-                    <pre>{item.get('response_headers', '')}</pre>
-                    <p><strong>Body:</strong></p>
-                    <pre>{item.get('response_body', '')}</pre>
-                </div>
+PAGE_TEMPLATE = """<html>
+<head>
+    <title>API Fuzzing Report{% if paged %} - Page {{ page }}{% endif %}</title>
+    <style>{{ style }}</style>
+    <script>
+        // Response bodies live in a side file, fetched the first time one is opened
+        var bodies = null, waiting = [];
+        function showBody(i) {
+            if (bodies) { fillBody(i); return; }
+            waiting.push(i);
+            if (waiting.length > 1) return;
+            var script = document.createElement("script");
+            script.src = "{{ bodies_src }}";
+            document.head.appendChild(script);
+        }
+        function reportBodiesLoaded(data) {
+            bodies = data;
+            waiting.forEach(fillBody);
+            waiting = [];
+        }
+        function fillBody(i) {
+            document.getElementById("body-" + i).textContent = bodies[i];
+            document.getElementById("load-" + i).remove();
+        }
+    </script>
+</head>
+<body>
+    <h1>API Fuzzing Report</h1>
+    <p>Generated on {{ generated }}</p>
+    {% if paged %}
+    <div class="nav">
+        <a href="{{ index_href }}">Index</a>
+        {% if prev_href %}<a href="{{ prev_href }}">&laquo; Page {{ page - 1 }}</a>{% endif %}
+        <span>Page {{ page }}</span>
+        {% if next_href %}<a href="{{ next_href }}">Page {{ page + 1 }} &raquo;</a>{% endif %}
+    </div>
+    {% endif %}
+    {% if not paged %}{% include "clusters.html" %}{% endif %}
+    {% for item in findings %}
+    <div class='finding'>
+        <h2>Packet {{ first + loop.index0 }}</h2>
+        <p><strong>URL:</strong> {{ item.url }}</p>
+        <p><strong>Method:</strong> {{ item.method }}</p>
+        <p><strong>Param:</strong> {{ item.param }}</p>
+        <p><strong>Payload:</strong> <code>{{ item.payload }}</code></p>
+        <p><strong>Status:</strong> {{ item.status }} {{ item.reason }}</p>
+        <p><strong>Length:</strong> {{ item.length }}{% if item.truncated %} (body truncated){% endif %}</p>
+        {% if item.reflected %}
+        <p><strong>Reflected:</strong> {{ item.reflected|join(", ") }}</p>
+        {% endif %}
+        {% if item.signatures %}
+        <p><strong>Signatures:</strong> {% for name in item.signatures %}<code>{{ name }}</code> {% endfor %}</p>
+        {% endif %}
+        {% if item.cluster %}
+        <p><strong>Cluster:</strong> #{{ item.cluster }}{% if item.cluster in cluster_counts %} ({{ cluster_counts[item.cluster] }} responses){% endif %}</p>
+        {% endif %}
+        <div class="req-resp">
+            <div class="column">
+                <h3>Request</h3>
+                <pre>{{ item.get('method', '') }} {{ item.get('url', '') }}</pre>
+                <p><strong>Headers:</strong></p>
+                <pre>{{ item.get('request_headers', '') }}</pre>
+                <p><strong>Body:</strong></p>
+                <pre>{{ item.get('request_body', '') }}</pre>
+            </div>
+            <div class="column">
+                <h3>Response</h3>
+                <p><strong>Headers:</strong></p>
+                <pre>{{ item.get('response_headers', '') }}</pre>
+                <p><strong>Body:</strong></p>
+                <button id="load-{{ loop.index0 }}" onclick="showBody({{ loop.index0 }})">Show body</button>
+                <pre id="body-{{ loop.index0 }}"></pre>
             </div>
         </div>
-        """
+    </div>
+    {% endfor %}
+</body>
+</html>
+"""
+
+INDEX_TEMPLATE = """<html>
+<head>
+    <title>API Fuzzing Report</title>
+    <style>{{ style }}</style>
+</head>
+<body>
+    <h1>API Fuzzing Report</h1>
+    <p>Generated on {{ generated }}</p>
+    <p>{{ total }} findings on {{ pages|length }} pages. Status codes: {{ statuses }}</p>
+    {% include "clusters.html" %}
+    <table>
+        <tr><th>Page</th><th>Packets</th><th>Status codes</th></tr>
+        {% for page in pages %}
+        <tr>
+            <td><a href="{{ page.href }}">Page {{ page.number }}</a></td>
+            <td>{{ page.first }}-{{ page.last }}</td>
+            <td>{{ page.statuses }}</td>
+        </tr>
+        {% endfor %}
+    </table>
+</body>
+</html>
+"""
+
+CLUSTERS_TEMPLATE = """{% if clusters %}
+    <h2>{{ clusters|length }} response clusters</h2>
+    <p>Near-duplicate responses are grouped; only the first few of each cluster are listed below.</p>
+    <table>
+        <tr><th>Cluster</th><th>Status</th><th>Interesting</th><th>Responses</th><th>Kept</th><th>Length</th><th>First payload</th></tr>
+        {% for cluster in clusters %}
+        <tr>
+            <td>#{{ cluster.id }}</td>
+            <td>{{ cluster.status }}</td>
+            <td>{{ "yes" if cluster.interesting else "no" }}</td>
+            <td>{{ cluster.count }}</td>
+            <td>{{ cluster.kept }}</td>
+            <td>{{ cluster.length }}</td>
+            <td><code>{{ cluster.payload }}</code></td>
+        </tr>
+        {% endfor %}
+    </table>
+{% endif %}"""
+
+_env = Environment(loader=DictLoader({
+    "page.html": PAGE_TEMPLATE,
+    "index.html": INDEX_TEMPLATE,
+    "clusters.html": CLUSTERS_TEMPLATE,
+}), autoescape=True)
+
+
+def _status_summary(counts):
+    return ", ".join(f"{status} x{count}" for status, count in sorted(counts.items()))
+
+
+def _render(template, path, **context):
+    # Stream the document to disk chunk by chunk instead of building one string
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in _env.get_template(template).generate(style=STYLE, **context):
+            f.write(chunk)
 
-    html += """
-    </body>
-    </html>
+
+def _write_bodies(path, findings):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("reportBodiesLoaded([\n")
+        for item in findings:
+            f.write(json.dumps(item.get("response_body", "")))
+            f.write(",\n")
+        f.write("]);\n")
+
+
+def generate_html_report(findings, output_path, page_size=500, clusters=None):
+    """Render findings (any iterable of finding dicts, e.g. read_findings()) as HTML.
+
+    Only one page of findings is held at a time. Up to page_size findings
+    go in output_path itself; beyond that output_path becomes an index
+    linking to pages in "<report>_files/". Response bodies are written to
+    a .js file next to each page and only loaded when opened.
+    clusters (from load_clusters()) adds a table of response clusters.
     """
+    output_dir = os.path.dirname(output_path)
+    base = os.path.splitext(os.path.basename(output_path))[0]
+    files_dir = os.path.join(output_dir, f"{base}_files")
+    os.makedirs(files_dir, exist_ok=True)
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    clusters = sorted(clusters or [], key=lambda c: (-c["count"], c["id"]))
+    cluster_counts = {c["id"]: c["count"] for c in clusters}
+
+    findings = iter(findings)
+    page_findings = list(islice(findings, page_size))
+    next_findings = list(islice(findings, page_size))
+    single = not next_findings
+
+    pages = []
+    totals = Counter()
+    number = 1
+    first = 1
+    while page_findings:
+        name = f"page-{number:04d}"
+        statuses = Counter(item.get("status") for item in page_findings)
+        totals.update(statuses)
+
+        _write_bodies(os.path.join(files_dir, f"{name}.bodies.js"), page_findings)
+        if single:
+            _render("page.html", output_path, findings=page_findings, first=first, paged=False,
+                    generated=generated, bodies_src=f"{base}_files/{name}.bodies.js",
+                    clusters=clusters, cluster_counts=cluster_counts)
+        else:
+            # The page count is unknown while streaming, so pages only link to their neighbours
+            _render("page.html", os.path.join(files_dir, f"{name}.html"),
+                    findings=page_findings, first=first, paged=True, page=number,
+                    generated=generated, bodies_src=f"{name}.bodies.js", cluster_counts=cluster_counts,
+                    index_href=f"../{os.path.basename(output_path)}",
+                    prev_href=f"page-{number - 1:04d}.html" if number > 1 else None,
+                    next_href=f"page-{number + 1:04d}.html" if next_findings else None)
+
+        pages.append({
+            "number": number,
+            "href": f"{base}_files/{name}.html",
+            "first": first,
+            "last": first + len(page_findings) - 1,
+            "statuses": _status_summary(statuses),
+        })
+
+        first += len(page_findings)
+        number += 1
+        page_findings = next_findings
+        next_findings = list(islice(findings, page_size)) if page_findings else []
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    if not single:
+        _render("index.html", output_path, pages=pages, total=first - 1,
+                statuses=_status_summary(totals), generated=generated, clusters=clusters)
@@ -0,0 +1,196 @@
+import json
+import re
+
+from json_diff import format_path
+from payload_encoding import HEADER, JSON_STRING, JSON_VALUE, PATH, QUERY, RAW, PayloadEncoder
+
+PLACEHOLDER_RE = re.compile(r"<<FUZZ_([^<>]+?)>>")
+
+
+def find_placeholders(text):
+    """Names of all <<FUZZ_name>> placeholders in text."""
+    return set(PLACEHOLDER_RE.findall(text or ""))
+
+
+class CompiledTemplate:
+    """A template parsed once into literal chunks and param slots.
+
+    Rendering fills the slots and joins everything in a single pass instead
+    of one str.replace() per placeholder. Each slot has an encoding context
+    (see payload_encoding) applied through the shared encoder cache.
+    Placeholders whose name is not in params are kept as literal text.
+    """
+
+    def __init__(self, text, params, encoder=None):
+        self.text = text or ""
+        self.params = list(params)
+        self.encoder = encoder or _RAW_ENCODER
+
+        index_of = {param: i for i, param in enumerate(self.params)}
+        chunks = []
+        slots = []  # (chunk position, param index)
+        spans = []  # (start, end) of each slot in text
+        last = 0
+        for match in PLACEHOLDER_RE.finditer(self.text):
+            param_index = index_of.get(match.group(1))
+            if param_index is None:
+                continue
+            chunks.append(self.text[last:match.start()])
+            slots.append((len(chunks), param_index))
+            spans.append(match.span())
+            chunks.append(None)
+            last = match.end()
+        chunks.append(self.text[last:])
+
+        self.slots = slots
+        self.spans = spans
+        self.contexts = [RAW] * len(slots)
+        self._text_chunks = chunks
+        self._byte_chunks = [c.encode("utf-8") if c is not None else None for c in chunks]
+
+    def render_text(self, values):
+        """values: one raw payload str per param, in params order."""
+        if not self.slots:
+            return self.text
+        encode = self.encoder.text
+        chunks = self._text_chunks[:]
+        for (pos, param_index), context in zip(self.slots, self.contexts):
+            chunks[pos] = encode(context, values[param_index])
+        return "".join(chunks)
+
+    def render(self, values):
+        """Like render_text() but straight to bytes."""
+        encode = self.encoder.bytes
+        chunks = self._byte_chunks[:]
+        for (pos, param_index), context in zip(self.slots, self.contexts):
+            chunks[pos] = encode(context, values[param_index])
+        return b"".join(chunks)
+
+
+_RAW_ENCODER = PayloadEncoder(enabled=False)
+
+
+def url_contexts(template):
+    contexts = []
+    for start, _ in template.spans:
+        prefix = template.text[:start]
+        if "?" in prefix or "#" in prefix:
+            contexts.append(QUERY)
+        elif "/" in prefix.partition("://")[2]:
+            contexts.append(PATH)
+        else:
+            # scheme or host: nothing sensible to escape
+            contexts.append(RAW)
+    return contexts
+
+
+def body_contexts(template, content_type=""):
+    if not template.slots:
+        return []
+
+    # Track whether each slot sits inside a JSON string literal
+    in_string = False
+    escaped = False
+    inside = []
+    pos = 0
+    for start, end in template.spans:
+        for ch in template.text[pos:start]:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = in_string
+            elif ch == '"':
+                in_string = not in_string
+        inside.append(in_string)
+        pos = end
+
+    # Only trust that if the body really is JSON once slots are filled
+    probe = []
+    pos = 0
+    for (start, end), in_str in zip(template.spans, inside):
+        probe.append(template.text[pos:start])
+        probe.append("x" if in_str else "0")
+        pos = end
+    probe.append(template.text[pos:])
+    try:
+        json.loads("".join(probe))
+        return [JSON_STRING if in_str else JSON_VALUE for in_str in inside]
+    except ValueError:
+        pass
+
+    if "x-www-form-urlencoded" in content_type.lower():
+        return [QUERY] * len(template.slots)
+    return [RAW] * len(template.slots)
+
+
+def param_json_paths(body, params):
+    """JSON paths (e.g. root.user.email) of the body values each param lands in."""
+    template = CompiledTemplate(body, params)
+    contexts = body_contexts(template)
+    if not contexts or contexts[0] not in (JSON_STRING, JSON_VALUE):
+        return {}
+
+    # Swap each slot for a marker string and find the markers in the parsed body
+    parts = []
+    pos = 0
+    for (start, end), (_, param_index), context in zip(template.spans, template.slots, contexts):
+        parts.append(template.text[pos:start])
+        marker = f"@@{param_index}@@"
+        parts.append(marker if context == JSON_STRING else f'"{marker}"')
+        pos = end
+    parts.append(template.text[pos:])
+    try:
+        document = json.loads("".join(parts))
+    except ValueError:
+        return {}
+
+    paths = {}
+
+    def walk(value, tokens):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(item, tokens + [key])
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                walk(item, tokens + [index])
+        elif isinstance(value, str):
+            for param_index in re.findall(r"@@(\d+)@@", value):
+                paths.setdefault(template.params[int(param_index)], []).append(format_path(tokens))
+
+    walk(document, [])
+    return paths
+
+
+class RequestTemplate:
+    """URL, body and header templates of a campaign, compiled once."""
+
+    def __init__(self, url, body, headers, params, encoder=None):
+        self.params = list(params)
+        self.encoder = encoder or _RAW_ENCODER
+        self.headers = dict(headers or {})
+
+        self.url = CompiledTemplate(url, self.params, self.encoder)
+        self.url.contexts = url_contexts(self.url)
+
+        content_type = next((v for k, v in self.headers.items() if k.lower() == "content-type"), "")
+        self.body = CompiledTemplate(body, self.params, self.encoder)
+        self.body.contexts = body_contexts(self.body, content_type)
+
+        self.header_templates = {}
+        for key, value in self.headers.items():
+            template = CompiledTemplate(value, self.params, self.encoder)
+            if template.slots:
+                template.contexts = [HEADER] * len(template.slots)
+                self.header_templates[key] = template
+
+    def render(self, values):
+        """Render (url, body bytes, headers) for one raw payload per param."""
+        url = self.url.render_text(values)
+        body = self.body.render(values)
+
+        headers = self.headers
+        if self.header_templates:
+            headers = {key: self.header_templates[key].render_text(values) if key in self.header_templates else value
+                       for key, value in self.headers.items()}
+
+        return url, body, headers
@@ -1,16 +1,158 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+
+CHUNK_SIZE = 1 << 16
+# Bodies up to this size are still read (and dropped) when bodies are not
+# wanted, so the socket goes back to the pool; bigger ones close it
+DRAIN_LIMIT = 1 << 16
+
+
+class BufferedResponse:
+    """The parts of requests.Response that the fuzzer reads, body read once.
+
+    content holds at most max_body_bytes (truncated is set if there was
+    more) and content_hash is its SHA-1, computed while reading. text is
+    decoded on first use and shared by every consumer afterwards.
+    """
+
+    def __init__(self, status_code, reason, headers, content=b"", encoding=None, content_hash=None, truncated=False):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.content_hash = content_hash or hashlib.sha1(content).hexdigest()
+        self.truncated = truncated
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            try:
+                self._text = str(self.content, self.encoding or "utf-8", errors="replace")
+            except LookupError:
+                self._text = str(self.content, "utf-8", errors="replace")
+        return self._text
+
+
+def read_response(response, max_bytes=None, read_body=True):
+    """Stream a requests response (sent with stream=True) into a BufferedResponse."""
+    digest = hashlib.sha1()
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        if not read_body:
+            length = response.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) <= DRAIN_LIMIT:
+                for _ in response.iter_content(CHUNK_SIZE):
+                    pass
+        else:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if max_bytes is not None and size + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - size]
+                    truncated = True
+                digest.update(chunk)
+                chunks.append(chunk)
+                size += len(chunk)
+                if truncated:
+                    break
+    finally:
+        # Back to the pool if fully read, otherwise the socket is closed
+        response.close()
+    return BufferedResponse(response.status_code, response.reason, response.headers, b"".join(chunks),
+                            response.encoding, digest.hexdigest(), truncated)
+
+
+class Transport:
+    """Long-lived HTTP transport owned by a fuzzing campaign.
+
+    Holds one requests.Session whose adapters keep a connection pool per
+    host, so consecutive payloads reuse sockets instead of paying a fresh
+    TCP/TLS handshake each time.
+    """
+
+    def __init__(self, pool_size=10, keep_alive=True, max_idle=30.0, proxies=None, max_body_bytes=None, read_body=True):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.max_idle = max_idle
+        self.proxies = proxies
+        self.max_body_bytes = max_body_bytes    # cap on the body bytes kept per response
+        self.read_body = read_body              # False: status and headers only
+
+        self.session = requests.Session()
+        # pool_connections = number of per-host pools cached, pool_maxsize = sockets kept per host
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self._last_used = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args, proxies=None):
+        # Every --threads worker needs its own pooled socket or they queue on each other
+        pool_size = max(getattr(args, "pool_size", 10) or 10, getattr(args, "threads", 1) or 1)
+        return cls(
+            pool_size=pool_size,
+            keep_alive=not getattr(args, "no_keep_alive", False),
+            max_idle=getattr(args, "max_idle", 30.0),
+            proxies=proxies,
+            max_body_bytes=getattr(args, "max_body_bytes", None) or None,
+            read_body=not getattr(args, "status_only", False),
+        )
+
+    def _touch(self, url):
+        # Drop sockets that sat idle longer than max_idle; servers and load
+        # balancers usually close them first and the next send would fail.
+        # HTTPAdapter.close() empties every pool, proxied ones included, and
+        # the adapter opens fresh ones on demand.
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_used.get(host)
+            if self.max_idle and last is not None and now - last > self.max_idle:
+                self.adapter.close()
+            self._last_used[host] = now
+
+    def send(self, method, url, headers=None, data=None, proxies=None):
+        self._touch(url)
+
+        req = requests.Request(
+            method=method,
+            url=url,
+            headers=headers,
+            data=data
+        )
+
+        prepared = self.session.prepare_request(req)
+        response = self.session.send(prepared, proxies=proxies or self.proxies, stream=True)
+
+        return prepared, read_response(response, self.max_body_bytes, self.read_body)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
 
-def prepare_and_send_request(method, url, headers=None, data=None, proxies=None):
-    session = requests.Session()
+    def __exit__(self, *exc):
+        self.close()
 
-    req = requests.Request(
-        method=method,
-        url=url,
-        headers=headers,
-        data=data
-    )
 
-    prepared = session.prepare_request(req)
-    response = session.send(prepared, proxies=proxies)
+def prepare_and_send_request(method, url, headers=None, data=None, proxies=None, transport=None):
+    # Without a campaign transport fall back to a one-shot session
+    if transport is None:
+        with Transport(pool_size=1, proxies=proxies) as one_shot:
+            return one_shot.send(method, url, headers=headers, data=data)
 
-    return prepared, response
+    return transport.send(method, url, headers=headers, data=data, proxies=proxies)
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import zlib
+
+
+def payload_hash(payload):
+    return hashlib.sha1(str(payload).encode("utf-8", errors="replace")).hexdigest()[:16]
+
+
+def read_archive_index(path):
+    """Stream the index entries of an archive, in the order they were saved."""
+    index_path = path + ".index"
+    if not os.path.exists(index_path):
+        return
+    with open(index_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_entry(path, entry, data=None):
+    """(head, body) bytes of one index entry; pass an open .data file to reuse it."""
+    f = data or open(path + ".data", "rb")
+    try:
+        blobs = []
+        for offset, length in (entry["head"], entry["body"]):
+            f.seek(offset)
+            blobs.append(zlib.decompress(f.read(length)))
+        return blobs[0], blobs[1]
+    finally:
+        if data is None:
+            f.close()
+
+
+class ResponseArchive:
+    """Append-only archive of the responses saved with --save.
+
+    <path>.data is a sequence of zlib blobs; <path>.index has one JSON
+    line per saved response with its request number, param, payload
+    (and payload hash) and the offsets of its head (status line and
+    headers) and body blobs. Bodies are content-addressed: a body with
+    the same SHA-1 as one already stored just points at that blob.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._bodies = {}   # body sha1 -> [offset, length]
+        for entry in read_archive_index(path):
+            self._bodies.setdefault(entry["sha1"], entry["body"])
+            self.count += 1
+        self._data = open(path + ".data", "ab")
+        self._index = open(path + ".index", "ab")
+
+    def _append(self, blob):
+        offset = self._data.tell()
+        compressed = zlib.compress(blob)
+        self._data.write(compressed)
+        return [offset, len(compressed)]
+
+    def add(self, num, param, payload, status, reason, headers, body, body_hash=None):
+        """Save one response; headers are (name, value) pairs, body is bytes."""
+        head = f"HTTP/1.1 {status} {reason}\n" + "".join(f"{k}: {v}\n" for k, v in headers) + "\n"
+        body_hash = body_hash or hashlib.sha1(body).hexdigest()
+        body_ref = self._bodies.get(body_hash)
+        if body_ref is None:
+            body_ref = self._bodies[body_hash] = self._append(body)
+        entry = {
+            "num": num,
+            "param": param,
+            "payload": payload,
+            "payload_hash": payload_hash(payload),
+            "status": status,
+            "sha1": body_hash,
+            "head": self._append(head.encode("utf-8", errors="replace")),
+            "body": body_ref,
+        }
+        self._index.write(json.dumps(entry).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def merge(self, other_path):
+        """Append every entry of another archive (e.g. a worker's), re-deduplicating bodies."""
+        with open(other_path + ".data", "rb") as data:
+            for entry in read_archive_index(other_path):
+                head, body = read_entry(other_path, entry, data)
+                body_ref = self._bodies.get(entry["sha1"])
+                if body_ref is None:
+                    body_ref = self._bodies[entry["sha1"]] = self._append(body)
+                entry = dict(entry, head=self._append(head), body=body_ref)
+                self._index.write(json.dumps(entry).encode("utf-8") + b"\n")
+                self.count += 1
+
+    def flush(self):
+        self._data.flush()
+        self._index.flush()
+
+    def tell(self):
+        """Position for checkpoints: [data offset, index offset]."""
+        return [self._data.tell(), self._index.tell()]
+
+    def truncate(self, position=None):
+        """Cut the archive back to a tell() position (empty it by default)."""
+        data_offset, index_offset = position or (0, 0)
+        self.flush()
+        self._data.truncate(data_offset)
+        self._index.truncate(index_offset)
+        self._data.seek(0, os.SEEK_END)
+        self._index.seek(0, os.SEEK_END)
+        # Forget bodies that were cut off
+        self._bodies = {}
+        self.count = 0
+        for entry in read_archive_index(self.path):
+            self._bodies.setdefault(entry["sha1"], entry["body"])
+            self.count += 1
+
+    def close(self):
+        if not self._index.closed:
+            self._data.close()
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
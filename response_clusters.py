@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+
+FINGERPRINT_BITS = 64
+MAX_TOKENS = 2000
+MIN_PAYLOAD_LENGTH = 3
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+# UUIDs, long hex ids and numbers differ between otherwise identical responses
+VOLATILE_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\b[0-9a-f]{16,}\b|\d+")
+
+_feature_hashes = {}
+
+
+def normalise(text, payloads=()):
+    """Response text with payload echoes and ids/numbers replaced by fixed tokens."""
+    for payload in sorted(payloads, key=len, reverse=True):
+        if len(payload) < MIN_PAYLOAD_LENGTH:
+            continue
+        text = text.replace(payload, " FUZZ ")
+        escaped = json.dumps(payload)[1:-1]
+        if escaped != payload:
+            text = text.replace(escaped, " FUZZ ")
+    return VOLATILE_RE.sub("0", text.lower())
+
+
+def _feature_hash(feature):
+    h = _feature_hashes.get(feature)
+    if h is None:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        # Bodies of one API share most features (keys, markup); past 64k the
+        # rest are simply re-hashed on every response
+        if len(_feature_hashes) < 1 << 16:
+            _feature_hashes[feature] = h
+    return h
+
+
+def simhash(text):
+    """64-bit SimHash of a normalised text over token unigrams and bigrams."""
+    tokens = TOKEN_RE.findall(text)[:MAX_TOKENS]
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    # Sum feature weights per byte value of the hash first, then per bit:
+    # 8 additions per feature instead of one per set bit
+    tables = [[0] * 256 for _ in range(FINGERPRINT_BITS // 8)]
+    for feature, weight in features.items():
+        h = _feature_hash(feature)
+        for table in tables:
+            table[h & 255] += weight
+            h >>= 8
+
+    # weight[bit] = sum of weights with the bit set - sum without it
+    total = sum(features.values())
+    weights = [-total] * FINGERPRINT_BITS
+    for index, table in enumerate(tables):
+        for value, weight in enumerate(table):
+            if not weight:
+                continue
+            bit = index * 8
+            while value:
+                if value & 1:
+                    weights[bit] += 2 * weight
+                value >>= 1
+                bit += 1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class Cluster:
+    """Responses of one shape: same status and diff outcome, near-identical bodies."""
+
+    def __init__(self, id, status, interesting, fingerprint, length=0, first=None, payload=None, count=0, kept=0):
+        self.id = id
+        self.status = status
+        self.interesting = interesting
+        self.fingerprint = fingerprint  # SimHash of the first member, never moves
+        self.length = length            # body length of the first member
+        self.first = first              # campaign position of the first member
+        self.payload = payload          # payload of the first member
+        self.count = count
+        self.kept = kept
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class ClusterIndex:
+    """Online near-duplicate clustering of responses with SimHash and LSH.
+
+    The fingerprint is split into distance + 1 bands, so two fingerprints
+    within distance bits share at least one band exactly; only clusters in
+    the same band buckets are compared. The first `exemplars` members of a
+    cluster are kept, the rest are only counted.
+    """
+
+    def __init__(self, exemplars=3, distance=6):
+        self.exemplars = exemplars
+        self.distance = distance
+        self.clusters = []
+        bands = distance + 1
+        self._bands = [(FINGERPRINT_BITS * i // bands, FINGERPRINT_BITS * (i + 1) // bands) for i in range(bands)]
+        self._buckets = {}
+        self._exact = {}    # normalised body hash -> cluster, skips SimHash for exact repeats
+
+    def _band_keys(self, status, interesting, fingerprint):
+        for index, (lo, hi) in enumerate(self._bands):
+            yield (status, interesting, index, fingerprint >> lo & ((1 << (hi - lo)) - 1))
+
+    def _nearest(self, status, interesting, fingerprint):
+        best, best_distance = None, self.distance + 1
+        for key in self._band_keys(status, interesting, fingerprint):
+            for cluster in self._buckets.get(key, ()):
+                distance = hamming(cluster.fingerprint, fingerprint)
+                if distance < best_distance or (distance == best_distance and best and cluster.id < best.id):
+                    best, best_distance = cluster, distance
+        return best
+
+    def _create(self, status, interesting, fingerprint, **fields):
+        cluster = Cluster(len(self.clusters) + 1, status, interesting, fingerprint, **fields)
+        self.clusters.append(cluster)
+        for key in self._band_keys(status, interesting, fingerprint):
+            self._buckets.setdefault(key, []).append(cluster)
+        return cluster
+
+    def add(self, status, interesting, text, payloads=(), num=None, payload=None):
+        """Assign one response to a cluster. Returns (cluster, keep)."""
+        normalised = normalise(text, payloads)
+        key = (status, interesting, hashlib.sha1(normalised.encode("utf-8", errors="replace")).digest())
+        cluster = self._exact.get(key)
+        if cluster is None:
+            fingerprint = simhash(normalised)
+            cluster = self._nearest(status, interesting, fingerprint)
+            if cluster is None:
+                cluster = self._create(status, interesting, fingerprint, length=len(text), first=num, payload=payload)
+            if len(self._exact) < 1 << 16:
+                self._exact[key] = cluster
+
+        cluster.count += 1
+        keep = cluster.kept < self.exemplars
+        if keep:
+            cluster.kept += 1
+        return cluster, keep
+
+    def merge(self, other):
+        """Fold a cluster dict from another index in (e.g. a worker's); returns the cluster it joined."""
+        status, interesting, fingerprint = other["status"], other["interesting"], other["fingerprint"]
+        cluster = self._nearest(status, interesting, fingerprint)
+        if cluster is None:
+            return self._create(status, interesting, fingerprint, length=other["length"], first=other["first"],
+                                payload=other["payload"], count=other["count"], kept=other["kept"])
+        cluster.count += other["count"]
+        cluster.kept += other["kept"]
+        return cluster
+
+    def state(self):
+        return [cluster.to_dict() for cluster in self.clusters]
+
+    @classmethod
+    def from_state(cls, state, exemplars=3, distance=6):
+        index = cls(exemplars, distance)
+        for fields in state or []:
+            fields = dict(fields)
+            index._create(fields.pop("status"), fields.pop("interesting"), fields.pop("fingerprint"),
+                          **{k: v for k, v in fields.items() if k != "id"})
+        return index
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.state(), f)
+
+    def __len__(self):
+        return len(self.clusters)
+
+
+def load_clusters(path):
+    """Cluster dicts saved by ClusterIndex.save(), in id order."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,189 @@
+import sqlite3
+
+from baseline_analyzer import body_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS payloads (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS requests (
+    num INTEGER PRIMARY KEY,        -- 1-based position in the campaign
+    method TEXT,
+    url TEXT,
+    headers TEXT,
+    body TEXT
+);
+CREATE TABLE IF NOT EXISTS params (
+    request_num INTEGER NOT NULL REFERENCES requests(num),
+    name TEXT NOT NULL,
+    payload_id INTEGER NOT NULL REFERENCES payloads(id),
+    PRIMARY KEY (request_num, name)
+);
+CREATE TABLE IF NOT EXISTS responses (
+    request_num INTEGER PRIMARY KEY REFERENCES requests(num),
+    status INTEGER,
+    reason TEXT,
+    length INTEGER,
+    hash TEXT,
+    interesting INTEGER,
+    headers TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_responses_status ON responses(status);
+CREATE INDEX IF NOT EXISTS idx_responses_length ON responses(length);
+CREATE INDEX IF NOT EXISTS idx_responses_hash ON responses(hash);
+CREATE INDEX IF NOT EXISTS idx_params_name ON params(name, payload_id);
+"""
+
+
+class ResultsDB:
+    """SQLite store of every response that passed the filters, one campaign per file.
+
+    Rows are buffered and written in one transaction per batch; WAL mode
+    lets worker processes and readers share the file. Request numbers are
+    the campaign positions, so a resumed run simply overwrites the rows it
+    replays.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        self._payload_ids = {}
+        self._requests = []
+        self._params = []
+        self._responses = []
+
+    def reset(self, meta=None):
+        """Empty the store for a fresh campaign and record its metadata."""
+        with self.conn:
+            for table in ("params", "responses", "requests", "payloads", "meta"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                  [(k, str(v)) for k, v in (meta or {}).items()])
+        self._payload_ids.clear()
+
+    def _payload_id(self, value):
+        payload_id = self._payload_ids.get(value)
+        if payload_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO payloads (value) VALUES (?)", (value,))
+            payload_id = self.conn.execute("SELECT id FROM payloads WHERE value = ?", (value,)).fetchone()[0]
+            # Combo runs repeat each wordlist entry across many rows; payloads
+            # past the first 64k fall back to the INSERT OR IGNORE/SELECT above
+            if len(self._payload_ids) < 1 << 16:
+                self._payload_ids[value] = payload_id
+        return payload_id
+
+    def add(self, num, values, prepared, response, interesting=False):
+        """Queue one request/response; values is {param: payload}."""
+        body = prepared.body.decode("utf-8", errors="replace") if isinstance(prepared.body, bytes) else prepared.body
+        self._requests.append((
+            num, prepared.method, prepared.url,
+            "\n".join(f"{k}: {v}" for k, v in prepared.headers.items()), body,
+        ))
+        for name, payload in values.items():
+            self._params.append((num, name, payload))
+        self._responses.append((
+            num, response.status_code, response.reason, len(response.text),
+            getattr(response, "content_hash", None) or body_hash(response.text),
+            int(bool(interesting)),
+            "\n".join(f"{k}: {v}" for k, v in response.headers.items()), response.text,
+        ))
+        if len(self._requests) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._requests:
+            return
+        with self.conn:
+            params = [(num, name, self._payload_id(payload)) for num, name, payload in self._params]
+            self.conn.executemany("INSERT OR REPLACE INTO requests VALUES (?, ?, ?, ?, ?)", self._requests)
+            self.conn.executemany("INSERT OR REPLACE INTO params VALUES (?, ?, ?)", params)
+            self.conn.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._responses)
+        self._requests.clear()
+        self._params.clear()
+        self._responses.clear()
+
+    def discard_after(self, num):
+        """Drop rows past a checkpoint; they are sent again on resume."""
+        self.flush()
+        with self.conn:
+            for table, column in (("params", "request_num"), ("responses", "request_num"), ("requests", "num")):
+                self.conn.execute(f"DELETE FROM {table} WHERE {column} > ?", (num,))
+
+    def meta(self):
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def query(self, status=None, param=None, payload=None, min_length=None, max_length=None,
+              longer_than_baseline=None, hash_prefix=None, interesting=False, limit=100):
+        """Rows (num, params, payloads, status, length, hash, url) matching every given filter.
+
+        Combo requests come back as one row, their params and payloads joined.
+        """
+        where = []
+        args = []
+        if status:
+            where.append(f"r.status IN ({', '.join('?' * len(status))})")
+            args.extend(status)
+        if param or payload is not None:
+            match = []
+            if param:
+                match.append("p.name = ?")
+                args.append(param)
+            if payload is not None:
+                match.append("pl.value = ?")
+                args.append(payload)
+            where.append("EXISTS (SELECT 1 FROM params p JOIN payloads pl ON pl.id = p.payload_id "
+                         f"WHERE p.request_num = r.request_num AND {' AND '.join(match)})")
+        if min_length is not None:
+            where.append("r.length >= ?")
+            args.append(min_length)
+        if max_length is not None:
+            where.append("r.length <= ?")
+            args.append(max_length)
+        if longer_than_baseline is not None:
+            baseline_length = int(self.meta().get("baseline_length", 0))
+            where.append("r.length > ?")
+            args.append(baseline_length * (1 + longer_than_baseline / 100.0))
+        if hash_prefix:
+            where.append("r.hash LIKE ?")
+            args.append(hash_prefix + "%")
+        if interesting:
+            where.append("r.interesting = 1")
+
+        # Params in the order they were fuzzed
+        joined = ("(SELECT group_concat(v, '{1}') FROM (SELECT {0} AS v FROM params p "
+                  "JOIN payloads pl ON pl.id = p.payload_id WHERE p.request_num = r.request_num ORDER BY p.rowid))")
+        sql = (f"SELECT r.request_num, {joined.format('p.name', ' & ')}, {joined.format('pl.value', ' | ')}, "
+               "r.status, r.length, r.hash, q.url "
+               "FROM responses r JOIN requests q ON q.num = r.request_num")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.request_num"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.conn.execute(sql, args).fetchall()
+
+    def response(self, num):
+        """(status, reason, headers, body) of one stored response."""
+        return self.conn.execute("SELECT status, reason, headers, body FROM responses WHERE request_num = ?",
+                                 (num,)).fetchone()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,110 @@
+import re
+
+# A line "name: pattern" names its signature; otherwise the pattern is its own name
+NAMED_LINE_RE = re.compile(r"^([\w.-]+):\s+(.*)$")
+
+INCLUDE_REGEX = "include-regex"
+
+
+def load_signatures(path):
+    """(name, pattern) pairs from a signature file: one regex per line, # comments."""
+    signatures = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            match = NAMED_LINE_RE.match(line)
+            if match:
+                signatures.append((match.group(1), match.group(2)))
+            else:
+                signatures.append((line, line))
+    return signatures
+
+
+class SignatureMatcher:
+    """Many regex signatures compiled into one case-insensitive alternation on bytes.
+
+    scan() walks a response body once and returns the names of the
+    signatures that hit. Each signature is wrapped in its own group, so
+    the outermost group of a match tells which one it was. A match
+    consumes its text, so a signature can be hidden by one that overlaps
+    it: if the pass found some, the signatures still missing are combined
+    again and scanned from the first match on (nothing can start before
+    it), until a pass finds nothing new. A signature present in every
+    response thus costs one extra pass, not one per signature.
+    """
+
+    def __init__(self, signatures):
+        self.names = []
+        self._patterns = []  # (pattern, group count), by signature index
+        for name, pattern in signatures:
+            try:
+                compiled = re.compile(pattern.encode("utf-8"), re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid signature {name!r}: {e}")
+            self.names.append(name)
+            self._patterns.append((pattern, compiled.groups))
+
+        self._combined = {}  # tuple of signature indexes -> (regex, group number -> index)
+        self._regex = None
+        if self._patterns:
+            try:
+                self._regex, self._groups = self._combine(tuple(range(len(self._patterns))))
+            except re.error as e:
+                # e.g. numbered backreferences, which shift once patterns are combined
+                raise ValueError(f"Signatures cannot be combined: {e}")
+
+    def _combine(self, indexes):
+        combined = self._combined.get(indexes)
+        if combined is None:
+            groups = {}  # wrapping group number -> signature index
+            alternatives = []
+            group = 1
+            for index in indexes:
+                pattern, pattern_groups = self._patterns[index]
+                groups[group] = index
+                alternatives.append(f"({pattern})")
+                group += 1 + pattern_groups
+            combined = (re.compile("|".join(alternatives).encode("utf-8"), re.IGNORECASE), groups)
+            # Only a few subsets ever recur (the signatures common in responses)
+            if len(self._combined) < 256:
+                self._combined[indexes] = combined
+        return combined
+
+    @classmethod
+    def from_args(cls, args):
+        """Matcher for --include-regex and --signatures, or None if neither is set."""
+        signatures = []
+        if getattr(args, "include_regex", None):
+            signatures.append((INCLUDE_REGEX, args.include_regex))
+        if getattr(args, "signatures", None):
+            signatures.extend(load_signatures(args.signatures))
+        return cls(signatures) if signatures else None
+
+    def scan(self, body):
+        """Names of the signatures found in body (bytes), in signature order."""
+        if self._regex is None:
+            return []
+        if isinstance(body, str):
+            body = body.encode("utf-8", errors="replace")
+        hits = set()
+        missing = tuple(range(len(self.names)))
+        regex, groups = self._regex, self._groups
+        pos = 0
+        while True:
+            first = None
+            for match in regex.finditer(body, pos):
+                if first is None:
+                    first = match.start()
+                hits.add(groups[match.lastindex])
+                if len(hits) == len(self.names):
+                    break
+            still_missing = tuple(index for index in missing if index not in hits)
+            # A pass with no match found nothing new: done
+            if first is None or not still_missing:
+                break
+            missing = still_missing
+            regex, groups = self._combine(missing)
+            pos = first
+        return [name for index, name in enumerate(self.names) if index in hits]
@@ -0,0 +1,30 @@
+import pickle
+
+from baseline_analyzer import Baseline, BaselineMask
+
+
+def _page(ts, nonce, rows=2000):
+    return "<html>\n" + "<p>stable row</p>\n" * rows + f"<span>ts={ts}</span> nonce: {nonce}\n"
+
+
+def test_mask_learns_volatile_tokens_of_large_text_bodies():
+    mask = BaselineMask.learn([(200, _page(1700000001, "ab12"), {}), (200, _page(1700000999, "cd34"), {})])
+    assert mask.anchors
+    assert mask.apply(_page(1800000000, "ffff")) == mask.apply(_page(1700000001, "ab12"))
+
+
+def test_text_baseline_ignores_volatile_tokens_only():
+    baseline = Baseline.learn([(200, "id: 123\nhello\n", {}), (200, "id: 456\nhello\n", {})])
+    assert baseline.compare(200, "id: 789\nhello\n") == (False, False)
+    assert baseline.compare(200, "id: 789\ngoodbye\n") == (False, True)
+
+
+def test_pickled_baseline_keeps_its_exclusions():
+    # --workers processes receive the learned Baseline pickled
+    baseline = Baseline(200, '{"ts": 1, "a": 2, "items": [{"at": 1}]}', ignore_paths=["root.ts", "root.**.at"])
+    copy = pickle.loads(pickle.dumps(baseline))
+    assert copy.compare(200, '{"ts": 5, "a": 2, "items": [{"at": 9}]}') == (False, False)
+    assert copy.compare(200, '{"ts": 5, "a": 3, "items": [{"at": 9}]}') == (False, True)
+
+    learned = Baseline.learn([(200, '{"ts": 1, "a": 2}', {}), (200, '{"ts": 2, "a": 2}', {})])
+    assert pickle.loads(pickle.dumps(learned)).compare(200, '{"ts": 3, "a": 2}') == (False, False)
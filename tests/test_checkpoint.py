@@ -0,0 +1,70 @@
+import argparse
+
+from checkpoint import Checkpointer, campaign_fingerprint, load_checkpoint
+from findings_sink import FindingsSink
+from fuzzer_engine import REDACTED, checkpoint_args, resumable_checkpoint
+
+
+def _args(tmp_path, **overrides):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("a\nb\nc\n")
+    values = dict(url="http://localhost/x", method="POST", body='{"q": "<<FUZZ_q>>"}', wordlist=str(wordlist),
+                  combo=False, checkpoint=str(tmp_path / "run.ckpt"), auth_header="Bearer secret",
+                  headers='{"X-Api-Key": "k"}')
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def test_resume_truncates_findings_written_after_the_checkpoint(tmp_path):
+    args = _args(tmp_path)
+    checkpointer = Checkpointer(args.checkpoint, campaign_fingerprint(args, ["q"], 0, 3))
+    findings = FindingsSink(str(tmp_path / "findings.jsonl"))
+    findings.write({"n": 1})
+    checkpointer.save(1, 3, counters={"sent": 1}, findings=findings)
+    findings.write({"n": 2})
+
+    state = load_checkpoint(args.checkpoint)
+    checkpointer.restore(state, findings=findings)
+    findings.close()
+    assert state["next_index"] == 1 and state["counters"] == {"sent": 1}
+    assert (tmp_path / "findings.jsonl").read_text().splitlines() == ['{"n": 1}']
+
+
+def test_restore_rejects_another_campaign(tmp_path):
+    args = _args(tmp_path)
+    Checkpointer(args.checkpoint, campaign_fingerprint(args, ["q"], 0, 3)).save(1, 3)
+    other = Checkpointer(args.checkpoint, campaign_fingerprint(_args(tmp_path, url="http://localhost/y"), ["q"], 0, 3))
+    try:
+        other.restore(load_checkpoint(args.checkpoint))
+    except ValueError:
+        return
+    assert False, "restore accepted a checkpoint of another campaign"
+
+
+def test_only_unfinished_checkpoints_of_the_same_campaign_are_resumable(tmp_path):
+    args = _args(tmp_path)
+    assert not resumable_checkpoint(args, ["q"])
+    checkpointer = Checkpointer(args.checkpoint, campaign_fingerprint(args, ["q"], 0, 3))
+    checkpointer.save(1, 3)
+    assert resumable_checkpoint(args, ["q"])
+    assert not resumable_checkpoint(_args(tmp_path, body='{"r": "<<FUZZ_q>>"}'), ["q"])
+    checkpointer.save(3, 3)
+    assert not resumable_checkpoint(args, ["q"])
+
+
+def test_secrets_are_redacted_from_saved_args(tmp_path):
+    saved = checkpoint_args(_args(tmp_path))
+    assert saved["auth_header"] == REDACTED and saved["headers"] == REDACTED
+    assert saved["url"] == "http://localhost/x"
+
+
+def test_saved_tells_whether_the_run_can_be_resumed(tmp_path):
+    args = _args(tmp_path)
+    checkpointer = Checkpointer(args.checkpoint, campaign_fingerprint(args, ["q"], 0, 3))
+    assert not checkpointer.saved
+    checkpointer.save(1, 3)
+    assert checkpointer.saved
+
+    resumed = Checkpointer(args.checkpoint, campaign_fingerprint(args, ["q"], 0, 3))
+    resumed.restore(load_checkpoint(args.checkpoint))
+    assert resumed.saved
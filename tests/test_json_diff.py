@@ -0,0 +1,29 @@
+from baseline_analyzer import Baseline
+from json_diff import compile_paths, json_diff, json_equal
+from request_template import param_json_paths
+
+
+def test_index_exclusion_with_ignore_order():
+    exclude = compile_paths(["root.a[1]"])
+    assert json_equal({"a": [1, 2, 3]}, {"a": [1, 9, 3]}, exclude)
+    assert not json_equal({"a": [1, 2, 3]}, {"a": [9, 2, 3]}, exclude)
+    assert json_diff({"a": [1, 2, 3]}, {"a": [9, 2, 3]}, exclude) == ["root.a[0]"]
+
+
+def test_index_exclusion_below_any_depth_and_in_nested_arrays():
+    assert json_equal({"x": {"a": [1, 2]}}, {"x": {"a": [1, 5]}}, compile_paths(["root.**.a[1]"]))
+    assert json_equal([{"t": [0, 1]}, {"t": [0, 1]}], [{"t": [0, 1]}, {"t": [0, 7]}], compile_paths(["root[*].t[1]"]))
+
+
+def test_wildcards_and_unordered_arrays():
+    exclude = compile_paths(["root.items[*].updatedAt"])
+    assert json_equal({"items": [{"id": 1, "updatedAt": 1}, {"id": 2, "updatedAt": 2}]},
+                      {"items": [{"id": 2, "updatedAt": 5}, {"id": 1, "updatedAt": 6}]}, exclude)
+    assert not json_equal({"items": [{"id": 1}]}, {"items": [{"id": 3}]}, exclude)
+
+
+def test_echoed_payload_in_array_is_not_a_change():
+    body = '{"tags": ["<<FUZZ_tag>>"], "name": "x"}'
+    baseline = Baseline(200, '{"tags": ["BASELINE"], "name": "x"}', param_paths=param_json_paths(body, ["tag"]))
+    assert baseline.compare(200, '{"tags": ["<script>"], "name": "x"}', current_param="tag") == (False, False)
+    assert baseline.compare(200, '{"tags": ["<script>"], "name": "y"}', current_param="tag") == (False, True)
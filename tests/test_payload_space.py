@@ -0,0 +1,31 @@
+import itertools
+
+from payload_space import ComboSpace
+
+LISTS = [["a", "b", "c"], ["1", "2"], ["x", "y", "z", "w"]]
+
+
+def test_indexing_follows_itertools_product():
+    space = ComboSpace(LISTS)
+    product = list(itertools.product(*LISTS))
+    assert len(space) == len(product) == 24
+    assert list(space) == product
+    assert [space[i] for i in range(len(space))] == product
+    assert space[-1] == product[-1]
+    assert all(space.index_of(combo) == i for i, combo in enumerate(product))
+    assert list(space.iter_range(5, 17)) == product[5:17]
+
+
+def test_index_errors():
+    space = ComboSpace(LISTS)
+    for bad in (24, -25):
+        try:
+            space[bad]
+        except IndexError:
+            continue
+        assert False, f"index {bad} did not raise"
+    try:
+        space.index_of(("a", "1", "nope"))
+    except ValueError:
+        return
+    assert False, "unknown payload did not raise"
@@ -0,0 +1,45 @@
+from rate_limiter import RateLimiter
+
+
+def _window(limiter, status, latency):
+    for _ in range(limiter.window):
+        limiter.observe(status, latency)
+
+
+def test_application_errors_do_not_slow_down():
+    limiter = RateLimiter(rate=10, adaptive=True, window=10)
+    _window(limiter, 500, 0.1)
+    assert limiter.rate > 10
+
+
+def test_gateway_errors_slow_down():
+    limiter = RateLimiter(rate=10, adaptive=True, window=10)
+    _window(limiter, 502, 0.1)
+    assert limiter.rate < 10
+    limiter = RateLimiter(rate=10, adaptive=True, window=10)
+    _window(limiter, None, 0.1)
+    assert limiter.rate < 10
+
+
+def test_healthy_latency_recovers_after_a_fast_window():
+    limiter = RateLimiter(rate=10, adaptive=True, window=10)
+    _window(limiter, 200, 0.01)
+    # Lasting slower but healthy latency: the healthy level rises to meet it
+    for _ in range(20):
+        _window(limiter, 200, 0.019)
+    assert limiter._healthy_p95 > 0.015
+    rate = limiter.rate
+    _window(limiter, 200, 0.03)
+    assert limiter.rate > rate
+
+
+def test_a_burst_of_429s_cuts_the_rate_once():
+    limiter = RateLimiter(rate=50, adaptive=True, window=10)
+    # Ten requests in flight when the server starts rate limiting
+    for _ in range(10):
+        limiter.observe(429, 0.05, retry_after="1")
+    assert limiter.rate == 25
+    assert limiter._paused_until > 0
+    # A request sent after the cut can cut it again
+    limiter.observe(429, 0.0)
+    assert limiter.rate == 12.5
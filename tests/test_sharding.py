@@ -0,0 +1,17 @@
+from fuzzer_engine import shard_range
+from payload_space import ComboSpace
+
+LISTS = [["a", "b", "c"], ["1", "2"], ["x", "y", "z", "w"]]
+
+
+def test_shards_cover_the_range_once_in_order():
+    for start, stop, count in ((0, 24, 5), (3, 10, 4), (0, 2, 4)):
+        shards = [shard_range(start, stop, index, count) for index in range(1, count + 1)]
+        assert shards[0][0] == start and shards[-1][1] == stop
+        assert all(hi == lo for (_, hi), (lo, _) in zip(shards, shards[1:]))
+        sizes = [hi - lo for lo, hi in shards]
+        assert max(sizes) - min(sizes) <= 1
+
+    space = ComboSpace(LISTS)
+    combos = [combo for index in range(1, 6) for combo in space.iter_range(*shard_range(0, len(space), index, 5))]
+    assert combos == list(space)
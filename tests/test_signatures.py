@@ -0,0 +1,24 @@
+from signatures import INCLUDE_REGEX, SignatureMatcher
+
+
+def test_overlapping_include_regex_and_signature_both_hit():
+    matcher = SignatureMatcher([(INCLUDE_REGEX, "syntax"), ("sql", "SQL syntax.*MySQL")])
+    assert matcher.scan(b"You have an error in your SQL syntax; check the MySQL manual") == [INCLUDE_REGEX, "sql"]
+
+
+def test_earlier_match_does_not_hide_later_signature():
+    matcher = SignatureMatcher([("admin", "admin"), ("email", r"[\w.]+@[\w.]+\.com")])
+    assert matcher.scan(b"contact admin@corp.com") == ["admin", "email"]
+
+
+def test_no_hit_and_case_insensitive():
+    matcher = SignatureMatcher([("trace", r"Traceback \(most recent call last\)")])
+    assert matcher.scan(b"all good") == []
+    assert matcher.scan("TRACEBACK (MOST RECENT CALL LAST)") == ["trace"]
+
+
+def test_signatures_hidden_behind_each_other_all_hit():
+    matcher = SignatureMatcher([("wide", "alpha.*gamma"), ("mid", "beta"), ("pair", "beta gamma"), ("none", "delta")])
+    assert matcher.scan(b"alpha beta gamma") == ["wide", "mid", "pair"]
+    # The common signature does not stop the others from matching later on
+    assert matcher.scan(b"alpha x gamma, then beta gamma") == ["wide", "mid", "pair"]
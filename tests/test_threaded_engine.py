@@ -0,0 +1,57 @@
+import threading
+import time
+
+from fuzzer_engine import FuzzJob, run_threaded_engine
+
+
+class StubCampaign:
+    """Just what run_threaded_engine uses: jobs(), send(), process() and fail()."""
+
+    def __init__(self, total):
+        self.total = total
+        self.generated = 0
+        self.handled = []
+        self.max_outstanding = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self._lock = threading.Lock()
+
+    def jobs(self, start=0, stop=None):
+        for index in range(start, self.total if stop is None else stop):
+            self.generated += 1
+            self.max_outstanding = max(self.max_outstanding, self.generated - len(self.handled))
+            yield FuzzJob(index + 1, "p", {"p": str(index)}, "http://stub/", b"", {})
+
+    def send(self, job):
+        with self._lock:
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        # Early jobs are the slowest, so responses complete out of order
+        time.sleep(0.002 * (job.num % 5 == 1) + 0.0005)
+        with self._lock:
+            self.concurrent -= 1
+        if job.num % 7 == 0:
+            raise ConnectionError("stub failure")
+        return "prepared", f"response {job.num}"
+
+    def process(self, job, prepared, response):
+        assert response == f"response {job.num}"
+        self.handled.append(job.num)
+
+    def fail(self, job, error):
+        assert isinstance(error, ConnectionError)
+        self.handled.append(job.num)
+
+
+def test_results_are_handled_in_job_order_with_a_bounded_window():
+    campaign = StubCampaign(60)
+    run_threaded_engine(campaign, threads=4)
+    assert campaign.handled == list(range(1, 61))
+    assert campaign.max_outstanding <= 2 * 4
+    assert 1 < campaign.max_concurrent <= 4
+
+
+def test_range_is_respected():
+    campaign = StubCampaign(60)
+    run_threaded_engine(campaign, threads=3, start=10, stop=25)
+    assert campaign.handled == list(range(11, 26))
@@ -0,0 +1,37 @@
+import os
+
+from wordlist import Wordlist
+
+LINES = ["  admin \r", "", " ", "\x1c\x1f", "\u00a0", "\t", "caf\u00e9 ", "\u00a0bob\u00a0", " x y ", "last"]
+
+
+def _expected():
+    return [line.strip() for line in LINES if line.strip()]
+
+
+def test_lines_are_stripped_like_str_strip(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes("\n".join(LINES).encode("utf-8"))
+    with Wordlist(str(path), use_cache=False) as words:
+        assert list(words) == _expected()
+        assert [words[i] for i in range(len(words))] == _expected()
+        assert words[-1] == "last"
+
+
+def test_index_sidecar_is_reused_and_holds_one_offset_per_payload(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes("\n".join(LINES).encode("utf-8") + b"\n")
+    with Wordlist(str(path)) as words:
+        assert len(words) == 5
+    index_size = os.path.getsize(str(path) + ".idx")
+    with Wordlist(str(path)) as words:
+        assert list(words) == _expected()
+    assert os.path.getsize(str(path) + ".idx") == index_size
+    assert index_size == 24 + 5 * 4  # header, then one 4-byte end offset per payload
+
+
+def test_empty_wordlist(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"")
+    with Wordlist(str(path)) as words:
+        assert len(words) == 0 and list(words) == []
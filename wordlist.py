@@ -0,0 +1,107 @@
+import mmap
+import os
+import re
+import struct
+from array import array
+
+# A line with at least one byte that is not ASCII whitespace. Such a line
+# may still be blank once decoded (NBSP, \x1c-\x1f...), so str.strip() decides.
+LINE_RE = re.compile(rb"^[^\n]*[^ \t\n\r\f\v][^\n]*", re.MULTILINE)
+
+INDEX_MAGIC = b"FZWL2\0\0\0"
+INDEX_HEADER = struct.Struct("<8sQQ")  # magic, file size, mtime_ns
+
+
+class Wordlist:
+    """Memory-mapped wordlist with a compact offsets index.
+
+    Lines are stripped and blank lines skipped, like the old
+    [line.strip() for line in f if line.strip()], but only the end offset
+    of each payload is kept in RAM: payload i is the text between the ends
+    of payloads i-1 and i, stripped (whatever lies in between is blank).
+    Offsets are 4 bytes each below 4 GB. The index is cached in a
+    "<wordlist>.idx" sidecar and reused while the wordlist is unchanged.
+    """
+
+    def __init__(self, path, use_cache=True):
+        self.path = path
+        self._mmap = None
+
+        stat = os.stat(path)
+        self._ends = array("I" if stat.st_size < 2 ** 32 else "Q")
+        if stat.st_size:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if not (use_cache and self._load_index(stat)):
+                self._build_index()
+                if use_cache:
+                    self._save_index(stat)
+
+        self._count = len(self._ends)
+
+    @property
+    def index_path(self):
+        return self.path + ".idx"
+
+    def _build_index(self):
+        mm = self._mmap
+        ends = self._ends
+        for match in LINE_RE.finditer(mm):
+            if mm[match.start():match.end()].decode("utf-8", errors="ignore").strip():
+                ends.append(match.end())
+
+    def _load_index(self, stat):
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, mtime_ns = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                    return False
+                data = f.read()
+        except (OSError, struct.error):
+            return False
+
+        if len(data) % self._ends.itemsize:
+            return False
+        self._ends.frombytes(data)
+        return True
+
+    def _save_index(self, stat):
+        # Best effort: a read-only wordlist directory just means no cache
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns))
+                self._ends.tofile(f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("wordlist index out of range")
+        start = self._ends[index - 1] if index else 0
+        return self._mmap[start:self._ends[index]].decode("utf-8", errors="ignore").strip()
+
+    def __iter__(self):
+        mm = self._mmap
+        start = 0
+        for end in self._ends:
+            yield mm[start:end].decode("utf-8", errors="ignore").strip()
+            start = end
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()